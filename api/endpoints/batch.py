@@ -0,0 +1,129 @@
+import asyncio
+from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException
+from app.logging import job_log_context
+from domain.schemas import BatchStatusResponse, EvaluateBatchRequest
+from infra.repositories.batches_repository import AsyncBatchesRepository
+from infra.repositories.files_repository import AsyncFilesRepository
+from infra.repositories.jobs_repository import AsyncJobsRepository
+from domain.services.evaluation_pipeline import prepare_reference_context, run_evaluation
+from domain.services.job_events import job_events
+from domain.services.result_cache import result_cache
+from domain.services.job_scheduler import (
+    QueueFullError,
+    SchedulerUnavailableError,
+    job_scheduler,
+)
+
+router = APIRouter()
+files_repo = AsyncFilesRepository()
+jobs_repo = AsyncJobsRepository()
+batches_repo = AsyncBatchesRepository()
+
+
+class _BatchRun:
+    """Shared state for one batch's member jobs, each of which is its own bulk-lane scheduler job.
+
+    Job resolution and reference retrieval run once, started by whichever
+    member runs first; the batch is finalized when the last member finishes.
+    """
+
+    def __init__(self, batch_id: str, body: EvaluateBatchRequest, size: int) -> None:
+        self.batch_id = batch_id
+        self.body = body
+        self.remaining = size
+        self.started = False
+        self.error: Optional[str] = None
+        self._context: Optional[asyncio.Task] = None
+
+    async def reference_context(self) -> Dict:
+        if self._context is None:
+            # Shared retrieval is logged under the batch id, each candidate under its job id.
+            with job_log_context(self.batch_id):
+                self._context = asyncio.create_task(prepare_reference_context(self.body.job_title))
+        return await asyncio.shield(self._context)
+
+
+async def _run_batch_job(run: _BatchRun, job_id: str, cv_id: str, report_id: str) -> None:
+    body = run.body
+    try:
+        if not run.started:
+            run.started = True
+            await batches_repo.update_status(run.batch_id, "processing")
+        with job_log_context(job_id):
+            try:
+                await jobs_repo.update_status(job_id, "processing")
+                try:
+                    context = await run.reference_context()
+                except Exception as e:
+                    run.error = str(e)
+                    raise RuntimeError(f"shared retrieval failed: {e}") from e
+                cv = await files_repo.get(cv_id)
+                report = await files_repo.get(report_id)
+                cache_key = await result_cache.make_key(
+                    cv["content_hash"], report["content_hash"], context["resolve"][0])
+                result = await result_cache.get_or_compute(
+                    cache_key,
+                    lambda: run_evaluation(
+                        body.job_title, cv["path"], report["path"],
+                        cv_hash=cv["content_hash"], report_hash=report["content_hash"],
+                        context=context, on_stage=job_events.stage_reporter(job_id)),
+                    force_refresh=body.force_refresh,
+                    key_for_model=lambda model: result_cache.make_key(
+                        cv["content_hash"], report["content_hash"], context["resolve"][0], model),
+                )
+                await jobs_repo.complete(job_id, result)
+                job_events.publish(job_id, "completed")
+            except Exception as e:
+                await jobs_repo.fail(job_id, str(e))
+                job_events.publish(job_id, "failed", error=str(e))
+    finally:
+        run.remaining -= 1
+        if run.remaining == 0:
+            await batches_repo.update_status(
+                run.batch_id, "failed" if run.error else "completed", error=run.error)
+
+
+def _to_response(batch: dict) -> BatchStatusResponse:
+    return BatchStatusResponse(**{k: batch[k] for k in BatchStatusResponse.model_fields if k in batch})
+
+
+@router.post("/evaluate/batch", response_model=BatchStatusResponse)
+async def evaluate_batch(body: EvaluateBatchRequest) -> BatchStatusResponse:
+    wanted = {fid for item in body.items for fid in (item.cv_id, item.report_id)}
+    missing = wanted - await files_repo.existing_ids(wanted)
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"file ids not found: {sorted(missing)}")
+
+    if len(body.items) > job_scheduler.max_queue:
+        raise HTTPException(
+            status_code=413,
+            detail=f"batch of {len(body.items)} exceeds the evaluation queue size ({job_scheduler.max_queue})")
+    try:
+        job_scheduler.check_capacity(len(body.items))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail="evaluation queue is full",
+                            headers={"Retry-After": str(e.retry_after)})
+    except SchedulerUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": "5"})
+
+    batch_id, job_ids = await batches_repo.create_batch(
+        body.job_title, [(item.cv_id, item.report_id) for item in body.items])
+    run = _BatchRun(batch_id, body, len(job_ids))
+    for job_id, item in zip(job_ids, body.items):
+        job_scheduler.submit(
+            job_id,
+            lambda job_id=job_id, item=item: _run_batch_job(run, job_id, item.cv_id, item.report_id),
+            lane="bulk")
+        job_events.publish(job_id, "queued", batch_id=batch_id)
+    return _to_response(await batches_repo.get(batch_id))
+
+
+@router.get("/evaluate/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch(batch_id: str) -> BatchStatusResponse:
+    batch = await batches_repo.get(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="batch not found")
+    return _to_response(batch)
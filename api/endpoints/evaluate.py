@@ -1,32 +1,96 @@
-import asyncio
+import logging
+from typing import Dict, Optional, Tuple
 from fastapi import APIRouter, HTTPException
+from app.logging import job_log_context
 from domain.schemas import EvaluateRequest, JobStatusResponse
-from infra.repositories.files_repository import FilesRepository
-from infra.repositories.jobs_repository import JobsRepository
-from domain.services.evaluation_pipeline import run_evaluation
+from infra.repositories.files_repository import AsyncFilesRepository
+from infra.repositories.jobs_repository import AsyncJobsRepository
+from domain.services.evaluation_pipeline import resolve_job, run_evaluation
+from domain.services.job_scheduler import (
+    QueueFullError,
+    SchedulerUnavailableError,
+    job_scheduler,
+)
+from domain.services.job_events import job_events
+from domain.services.result_cache import result_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
-files_repo = FilesRepository()
-jobs_repo = JobsRepository()
+files_repo = AsyncFilesRepository()
+jobs_repo = AsyncJobsRepository()
+
+
+async def _run_job(job_id: str, body: EvaluateRequest, cv: Dict, report: Dict,
+                   resolved: Optional[Tuple], cache_key: Optional[str]) -> None:
+    with job_log_context(job_id):
+        try:
+            await jobs_repo.update_status(job_id, "processing")
+            context = {"resolve": resolved} if resolved else None
+            result = await result_cache.get_or_compute(
+                cache_key,
+                lambda: run_evaluation(
+                    body.job_title, cv["path"], report["path"],
+                    cv_hash=cv["content_hash"], report_hash=report["content_hash"],
+                    context=context, on_stage=job_events.stage_reporter(job_id)),
+                force_refresh=body.force_refresh,
+                key_for_model=lambda model: result_cache.make_key(
+                    cv["content_hash"], report["content_hash"], resolved[0], model),
+            )
+            await jobs_repo.complete(job_id, result)
+            job_events.publish(job_id, "completed")
+        except Exception as e:
+            await jobs_repo.fail(job_id, str(e))
+            job_events.publish(job_id, "failed", error=str(e))
 
 
 @router.post("/evaluate", response_model=JobStatusResponse)
 async def evaluate(body: EvaluateRequest) -> JobStatusResponse:
-    if not (files_repo.exists(body.cv_id) and files_repo.exists(body.report_id)):
+    cv = await files_repo.get(body.cv_id)
+    report = await files_repo.get(body.report_id)
+    if not (cv and report):
         raise HTTPException(
             status_code=404, detail="cv_id or report_id not found")
 
-    job_id = jobs_repo.create_job(body.job_title, body.cv_id, body.report_id)
+    # Admission first: resolving the job title may call the embeddings provider and vector store.
+    try:
+        job_scheduler.check_capacity()
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail="evaluation queue is full",
+                            headers={"Retry-After": str(e.retry_after)})
+    except SchedulerUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": "5"})
 
-    async def runner():
-        try:
-            jobs_repo.update_status(job_id, "processing")
-            cv_path = files_repo.get_path(body.cv_id)
-            report_path = files_repo.get_path(body.report_id)
-            result = await run_evaluation(body.job_title, cv_path, report_path)
-            jobs_repo.complete(job_id, result)
-        except Exception as e:
-            jobs_repo.fail(job_id, str(e))
+    resolved, cache_key = None, None
+    try:
+        resolved = await resolve_job(body.job_title)
+        cache_key = await result_cache.make_key(
+            cv["content_hash"], report["content_hash"], resolved[0])
+    except Exception as e:
+        logger.warning("Job resolution before queueing failed; skipping result cache: %s", e)
+
+    if cache_key and not body.force_refresh:
+        cached = await result_cache.lookup(cache_key)
+        if cached is not None:
+            job_id = await jobs_repo.create_job(body.job_title, body.cv_id, body.report_id)
+            await jobs_repo.complete(job_id, cached)
+            job_events.publish(job_id, "completed")
+            job = await jobs_repo.get(job_id)
+            return JobStatusResponse(id=job_id, status=job["status"], result=job["result"])
 
-    asyncio.create_task(runner())
-    return JobStatusResponse(id=job_id, status="queued")
+    job_id = await jobs_repo.create_job(body.job_title, body.cv_id, body.report_id)
+    try:
+        position = job_scheduler.submit(
+            job_id, lambda: _run_job(job_id, body, cv, report, resolved, cache_key),
+            lane=body.priority)
+    except QueueFullError as e:
+        # The queue filled up while this request was resolving the job title.
+        await jobs_repo.fail(job_id, "evaluation queue is full")
+        raise HTTPException(status_code=429, detail="evaluation queue is full",
+                            headers={"Retry-After": str(e.retry_after)})
+    job_events.publish(job_id, "queued")
+    return JobStatusResponse(id=job_id, status="queued",
+                             queue_position=position,
+                             queue_depth=job_scheduler.depth(),
+                             queue_wait_ms=0.0)
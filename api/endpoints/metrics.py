@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from domain.services.job_scheduler import job_scheduler
+from infra.metrics.instruments import JOBS_IN_FLIGHT, JOBS_QUEUED
+from infra.metrics.registry import registry
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    JOBS_QUEUED.set(job_scheduler.depth())
+    JOBS_IN_FLIGHT.set(job_scheduler.running)
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,14 +1,86 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from typing import AsyncIterator, Dict
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from domain.schemas import JobStatusResponse
-from infra.repositories.jobs_repository import JobsRepository
+from domain.services.job_events import TERMINAL_STAGES, job_events
+from domain.services.job_scheduler import job_scheduler
+from infra.repositories.jobs_repository import AsyncJobsRepository
 
 router = APIRouter()
-jobs_repo = JobsRepository()
+jobs_repo = AsyncJobsRepository()
+
+MAX_WAIT_SECONDS = 30.0
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+def _to_response(job: Dict) -> JobStatusResponse:
+    last = job_events.last(job["id"])
+    return JobStatusResponse(id=job["id"], status=job["status"], result=job.get("result"), error=job.get("error"),
+                             queue_position=job_scheduler.position(job["id"]),
+                             queue_depth=job_scheduler.depth(),
+                             queue_wait_ms=job_scheduler.queue_wait_ms(job["id"]),
+                             stage=last["stage"] if last else None)
 
 
 @router.get("/result/{job_id}", response_model=JobStatusResponse)
-async def get_result(job_id: str) -> JobStatusResponse:
-    job = jobs_repo.get(job_id)
+async def get_result(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS,
+                        description="Seconds to hold the request open until the job changes stage"),
+) -> JobStatusResponse:
+    last = job_events.last(job_id)
+    if wait and last is not None and last["stage"] not in TERMINAL_STAGES:
+        # Known in-flight job: block on the bus instead of re-reading the DB.
+        await job_events.wait_for_change(job_id, timeout=wait)
+        job = await jobs_repo.get(job_id)
+    elif wait:
+        # Subscribe before reading the DB so a transition in between is not missed.
+        with job_events.subscribe(job_id) as q:
+            job = await jobs_repo.get(job_id)
+            if job and job["status"] not in TERMINAL_STAGES:
+                try:
+                    await asyncio.wait_for(q.get(), timeout=wait)
+                    job = await jobs_repo.get(job_id)
+                except asyncio.TimeoutError:
+                    pass
+    else:
+        job = await jobs_repo.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
-    return JobStatusResponse(id=job["id"], status=job["status"], result=job.get("result"), error=job.get("error"))
+    return _to_response(job)
+
+
+def _sse(event: Dict) -> str:
+    return f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/result/{job_id}/events")
+async def stream_result_events(job_id: str) -> StreamingResponse:
+    """Server-Sent Events stream of stage transitions; closes after completed/failed."""
+    job = await jobs_repo.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+
+    async def events() -> AsyncIterator[str]:
+        with job_events.subscribe(job_id) as q:
+            current = job_events.last(job_id) or {
+                "job_id": job_id, "stage": job["status"], "seq": 0}
+            if job["status"] in TERMINAL_STAGES:
+                current = {**current, "stage": job["status"]}
+            yield _sse(current)
+            if current["stage"] in TERMINAL_STAGES:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(q.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
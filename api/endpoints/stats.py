@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from domain.services.context_cache import reference_cache
+from domain.services.job_scheduler import job_scheduler
+from domain.services.result_cache import result_cache
+from infra.http.pool import http_pool
+from infra.http.rate_limit import limiter_stats
+from infra.llm.client import provider_router
+from infra.rag.catalog_index import catalog_index
+from infra.rag.embedding_cache import embedding_cache
+from infra.rag.embeddings import embedding_batcher
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def runtime_stats():
+    return {
+        "http_pool": http_pool.stats(),
+        "provider_limits": limiter_stats(),
+        "llm_providers": provider_router.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "embedding_batcher": embedding_batcher.stats(),
+        "result_cache": result_cache.stats(),
+        "reference_cache": reference_cache.stats(),
+        "job_catalog": catalog_index.stats(),
+        "scheduler": {"queue_depth": job_scheduler.depth(), "running": job_scheduler.running},
+    }
@@ -1,30 +1,41 @@
 import os
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, Request, UploadFile, File, HTTPException
 from typing import Optional
 from app.settings import settings
 from domain.schemas import UploadResponse
-from infra.repositories.files_repository import FilesRepository
+from infra.repositories.files_repository import AsyncFilesRepository
+from infra.storage.uploads import UploadTooLargeError, store_upload
+from domain.services.document_text import schedule_extraction
 
 router = APIRouter()
-files_repo = FilesRepository()
+files_repo = AsyncFilesRepository()
 
 
 @router.post("/upload", response_model=UploadResponse)
-async def upload(cv: Optional[UploadFile] = File(default=None),
+async def upload(request: Request,
+                 cv: Optional[UploadFile] = File(default=None),
                  report: Optional[UploadFile] = File(default=None)) -> UploadResponse:
     if not cv and not report:
         raise HTTPException(
             status_code=400, detail="Upload at least one file: 'cv' or 'report'")
+    max_bytes = settings.UPLOAD_MAX_BYTES
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > 2 * max_bytes + 64 * 1024:
+        raise HTTPException(status_code=413, detail="Upload too large")
     os.makedirs(settings.STORAGE_DIR, exist_ok=True)
     resp = UploadResponse()
 
     async def save_one(f: UploadFile, ftype: str) -> str:
         name = f.filename or "uploaded.pdf"
-        path = os.path.join(settings.STORAGE_DIR, name.replace(" ", "_"))
-        content = await f.read()
-        with open(path, "wb") as out:
-            out.write(content)
-        return files_repo.save(ftype=ftype, path=path, name=name)
+        try:
+            path, content_hash, _ = await store_upload(f, settings.STORAGE_DIR, max_bytes)
+        except UploadTooLargeError as e:
+            raise HTTPException(
+                status_code=413, detail=f"'{ftype}' exceeds {e.max_bytes} bytes")
+        fid = await files_repo.save(ftype=ftype, path=path, name=name,
+                                    content_hash=content_hash)
+        await schedule_extraction(path, content_hash)
+        return fid
 
     if cv:
         resp.cv_id = await save_one(cv, "cv")
@@ -1,11 +1,17 @@
 from fastapi import APIRouter
 from api.endpoints.upload import router as upload_router
 from api.endpoints.evaluate import router as evaluate_router
+from api.endpoints.batch import router as batch_router
 from api.endpoints.result import router as result_router
 from api.endpoints.health import router as health_router
+from api.endpoints.stats import router as stats_router
+from api.endpoints.metrics import router as metrics_router
 
 api_router = APIRouter()
 api_router.include_router(upload_router, tags=["upload"])
 api_router.include_router(evaluate_router, tags=["evaluate"])
+api_router.include_router(batch_router, tags=["evaluate"])
 api_router.include_router(result_router, tags=["result"])
 api_router.include_router(health_router, tags=["health"])
+api_router.include_router(stats_router, tags=["stats"])
+api_router.include_router(metrics_router, tags=["stats"])
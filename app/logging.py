@@ -1,9 +1,155 @@
-import logging, sys
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
 from app.settings import settings
 
+# Job being processed by the current task; StageGraph tasks inherit it.
+job_id_var: ContextVar[Optional[str]] = ContextVar("job_id", default=None)
+
+# LogRecord attributes that are not caller-supplied `extra=` fields.
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "job_id"}
+
+_listeners: List[logging.handlers.QueueListener] = []
+_eval_handler: Optional[logging.Handler] = None
+
+
+@contextmanager
+def job_log_context(job_id: str) -> Iterator[None]:
+    """Tag every record logged inside the block (and tasks it spawns) with `job_id`."""
+    token = job_id_var.set(job_id)
+    try:
+        yield
+    finally:
+        job_id_var.reset(token)
+
+
+class JobContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "job_id"):
+            record.job_id = job_id_var.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, job_id, msg, any `extra=` fields, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "job_id": getattr(record, "job_id", None),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                out[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Numbered-backup rotation when the file reaches `max_bytes` or every `interval_seconds`."""
+
+    def __init__(self, filename: str, max_bytes: int, interval_seconds: float, backup_count: int) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.interval_seconds = interval_seconds
+        self.rollover_at = self._next_rollover()
+
+    def _next_rollover(self) -> float:
+        return time.time() + self.interval_seconds if self.interval_seconds > 0 else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at and os.path.exists(self.baseFilename):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = self._next_rollover()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks the caller: records are dropped (and counted) when the queue is full.
+
+    Only the message and traceback are rendered on the calling thread; JSON or
+    text formatting and the file write happen on the listener thread.
+    """
+
+    def __init__(self, q: queue.Queue) -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def queued(*handlers: logging.Handler) -> DroppingQueueHandler:
+    """Front `handlers` with a bounded queue drained by a background thread."""
+    q: queue.Queue = queue.Queue(maxsize=max(1, settings.LOG_QUEUE_SIZE))
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    handler = DroppingQueueHandler(q)
+    handler.addFilter(JobContextFilter())
+    return handler
+
+
+def stop_log_listeners() -> None:
+    """Flush queued records and stop the writer threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_log_listeners)
+
+
+def evaluation_log_handler() -> logging.Handler:
+    """Process-wide JSON-lines handler for the `evaluation_pipeline` logger."""
+    global _eval_handler
+    if _eval_handler is None:
+        file_handler = SizeAndTimeRotatingFileHandler(
+            settings.EVAL_LOG_PATH,
+            max_bytes=settings.EVAL_LOG_MAX_BYTES,
+            interval_seconds=settings.EVAL_LOG_ROTATE_SECONDS,
+            backup_count=settings.EVAL_LOG_BACKUPS,
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+        _eval_handler = queued(file_handler)
+    return _eval_handler
+
+
 def configure_logging():
+    if logging.getLogger().handlers:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
     logging.basicConfig(
         level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)]
-    )
\ No newline at end of file
+        handlers=[queued(stream)],
+    )
@@ -3,15 +3,33 @@ from app.settings import settings
 from app.logging import configure_logging
 from app.error_handlers import attach_error_handlers
 from api.router import api_router
-from infra.db.session import init_db
+from infra.db.session import close_db, init_db
+from domain.services.job_scheduler import job_scheduler
+from infra.http.pool import http_pool
+from infra.pdf.extraction import pdf_extractor
+from infra.rag.catalog_index import catalog_index
+from infra.rag.vector_store import close_store
 
 configure_logging()
 app = FastAPI(title=settings.APP_NAME)
 
 
 @app.on_event("startup")
-def _on_startup():
+async def _on_startup():
     init_db()
+    await http_pool.start()
+    pdf_extractor.start()
+    await job_scheduler.start()
+    await catalog_index.load()
+
+
+@app.on_event("shutdown")
+async def _on_shutdown():
+    await job_scheduler.close()
+    await http_pool.close()
+    pdf_extractor.close()
+    await close_store()
+    await close_db()
 
 
 attach_error_handlers(app)
@@ -8,15 +8,72 @@ class Settings(BaseModel):
     APP_NAME: str = os.getenv("APP_NAME", "AI CV & Project Evaluator")
     ENV: str = os.getenv("ENV", "development")
     STORAGE_DIR: str = os.getenv("STORAGE_DIR", "storage")
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    EVAL_LOG_PATH: str = os.getenv("EVAL_LOG_PATH", "evaluation_debug.log")
+    EVAL_LOG_LEVEL: str = os.getenv("EVAL_LOG_LEVEL", "INFO")
+    EVAL_LOG_MAX_BYTES: int = int(os.getenv("EVAL_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    EVAL_LOG_ROTATE_SECONDS: float = float(os.getenv("EVAL_LOG_ROTATE_SECONDS", "86400"))
+    EVAL_LOG_BACKUPS: int = int(os.getenv("EVAL_LOG_BACKUPS", "5"))
     SQLITE_PATH: str = os.getenv("SQLITE_PATH", "app.sqlite3")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_POOL_SIZE: int = int(os.getenv("SQLITE_POOL_SIZE", "10"))
+    SQLITE_POOL_MAX_OVERFLOW: int = int(os.getenv("SQLITE_POOL_MAX_OVERFLOW", "10"))
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "qdrant").lower()
+    VECTOR_STORE_PATH: str = os.getenv("VECTOR_STORE_PATH", "vector_store")
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     QDRANT_API_KEY: str | None = os.getenv("QDRANT_API_KEY") or None
+    QDRANT_PREFER_GRPC: bool = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+    QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
     OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY") or None
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     OPENAI_EMBEDDING_MODEL: str = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    OPENAI_EMBEDDING_DIMENSIONS: int | None = int(os.getenv("OPENAI_EMBEDDING_DIMENSIONS", "0")) or None
+    EMBED_MAX_BATCH_ITEMS: int = int(os.getenv("EMBED_MAX_BATCH_ITEMS", "2048"))
+    EMBED_MAX_BATCH_TOKENS: int = int(os.getenv("EMBED_MAX_BATCH_TOKENS", "300000"))
+    EMBED_CONCURRENCY: int = int(os.getenv("EMBED_CONCURRENCY", "4"))
+    EMBED_MICROBATCH_MAX_ITEMS: int = int(os.getenv("EMBED_MICROBATCH_MAX_ITEMS", "256"))
+    EMBED_MICROBATCH_WAIT_MS: float = float(os.getenv("EMBED_MICROBATCH_WAIT_MS", "5"))
+    EMBED_CACHE_MAX_ITEMS: int = int(os.getenv("EMBED_CACHE_MAX_ITEMS", "10000"))
+    EMBED_CACHE_PATH: str | None = os.getenv("EMBED_CACHE_PATH", "embedding_cache.sqlite3") or None
+    REFERENCE_CACHE_MAX_ITEMS: int = int(os.getenv("REFERENCE_CACHE_MAX_ITEMS", "256"))
+    CORPUS_VERSION_TTL_SECONDS: float = float(os.getenv("CORPUS_VERSION_TTL_SECONDS", "5"))
     OPENROUTER_API_KEY: str | None = os.getenv("OPENROUTER_API_KEY") or None
     OPENROUTER_MODEL: str = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
+    OPENROUTER_BASE_URL: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1").rstrip("/")
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_TIMEOUT_SECONDS: float = float(os.getenv("PDF_TIMEOUT_SECONDS", "60"))
+    PDF_PAGES_PER_TASK: int = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+    LLM_DOC_TOKEN_BUDGET: int = int(os.getenv("LLM_DOC_TOKEN_BUDGET", "2500"))
+    CV_REF_TOKEN_BUDGET: int = int(os.getenv("CV_REF_TOKEN_BUDGET", "2000"))
+    PROJECT_REF_TOKEN_BUDGET: int = int(os.getenv("PROJECT_REF_TOKEN_BUDGET", "2000"))
+    PIPELINE_PDF_CONCURRENCY: int = int(os.getenv("PIPELINE_PDF_CONCURRENCY", "4"))
+    PIPELINE_RETRIEVAL_CONCURRENCY: int = int(os.getenv("PIPELINE_RETRIEVAL_CONCURRENCY", "16"))
+    PIPELINE_LLM_CONCURRENCY: int = int(os.getenv("PIPELINE_LLM_CONCURRENCY", "8"))
+    SCHEDULER_WORKERS: int = int(os.getenv("SCHEDULER_WORKERS", "8"))
+    SCHEDULER_MAX_QUEUE: int = int(os.getenv("SCHEDULER_MAX_QUEUE", "200"))
+    SCHEDULER_BULK_EVERY: int = int(os.getenv("SCHEDULER_BULK_EVERY", "4"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    OPENAI_RPM: int = int(os.getenv("OPENAI_RPM", "0"))
+    OPENAI_TPM: int = int(os.getenv("OPENAI_TPM", "0"))
+    OPENROUTER_RPM: int = int(os.getenv("OPENROUTER_RPM", "0"))
+    OPENROUTER_TPM: int = int(os.getenv("OPENROUTER_TPM", "0"))
+    PROVIDER_INITIAL_CONCURRENCY: int = int(os.getenv("PROVIDER_INITIAL_CONCURRENCY", "8"))
+    PROVIDER_MAX_CONCURRENCY: int = int(os.getenv("PROVIDER_MAX_CONCURRENCY", "32"))
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_HEDGE_MIN_DELAY_MS: float = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "500"))
+    LLM_HEDGE_INITIAL_DELAY_MS: float = float(os.getenv("LLM_HEDGE_INITIAL_DELAY_MS", "8000"))
+    LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEALTH_WINDOW: int = int(os.getenv("LLM_HEALTH_WINDOW", "200"))
+    LLM_BREAKER_ERROR_RATE: float = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+    LLM_BREAKER_MIN_CALLS: int = int(os.getenv("LLM_BREAKER_MIN_CALLS", "10"))
+    LLM_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
 
 @lru_cache
 def get_settings() -> Settings:
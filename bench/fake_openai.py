@@ -0,0 +1,204 @@
+"""OpenAI-compatible stand-in for load tests: chat completions and embeddings with injected latency and faults.
+
+Run standalone with ``python -m bench.fake_openai --port 8900`` and point
+``OPENAI_BASE_URL`` at ``http://127.0.0.1:8900/v1``.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+DEFAULT_DIMENSIONS = 1536
+
+
+@dataclass
+class FaultProfile:
+    chat_latency_ms: float = 800.0
+    embed_latency_ms: float = 60.0
+    # Shape of the lognormal latency distribution; 0 makes every call take exactly the median.
+    latency_sigma: float = 0.4
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_s: float = 1.0
+    seed: int = 7
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def fake_embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit vector per text, so repeated inputs embed identically."""
+    vec = np.random.default_rng(_digest(text)).standard_normal(dimensions).astype(np.float32)
+    vec /= np.linalg.norm(vec)
+    return vec.tolist()
+
+
+def _catalog_reply(prompt: str) -> Dict:
+    # Ingestion sends "FILE: <Role>_JobDesc.pdf" ahead of the JD text; the role name becomes the title.
+    m = re.search(r"([\w\-]+?)(?:_JobDesc|_JD)?\.pdf", prompt, flags=re.I)
+    title = " ".join((m.group(1) if m else "Unknown Role").replace("_", " ").split())
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return {
+        "title": title,
+        "aliases": [f"{level} {title}".strip() for level in ("", "Senior", "Junior", "Lead")],
+        "tags": slug.split("-")[:5],
+        "job_key": f"{slug}-v1",
+    }
+
+
+def chat_reply(prompt: str) -> Dict:
+    """Schema-valid JSON for whichever of the app's prompts `prompt` is.
+
+    The instructions come before any CV/report text, so the output key named
+    earliest identifies the prompt even when the documents mention other keys.
+    """
+    rng = random.Random(_digest(prompt))
+    found = {key: prompt.find(key) for key in ("overall_summary", "job_key", "cv_match_rate", "project_score")}
+    found = {key: pos for key, pos in found.items() if pos >= 0}
+    kind = min(found, key=found.get) if found else None
+    if kind == "overall_summary":
+        return {"overall_summary": "Synthetic summary for load testing. The candidate shows a plausible "
+                                   "match. The project meets most requirements. Recommended for review."}
+    if kind == "job_key":
+        return _catalog_reply(prompt)
+    if kind == "cv_match_rate":
+        return {"cv_match_rate": round(rng.uniform(0.3, 0.9), 2),
+                "cv_feedback": ["Synthetic CV finding.", "Synthetic CV gap."]}
+    if kind == "project_score":
+        return {"project_score": round(rng.uniform(2.0, 4.8), 1),
+                "project_feedback": ["Synthetic project finding.", "Synthetic project gap."]}
+    return {"ok": True}
+
+
+def create_app(profile: FaultProfile) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    rng = random.Random(profile.seed)
+    counters = {"chat": 0, "embeddings": 0, "embedded_inputs": 0, "rate_limited": 0, "errors": 0}
+    state = {"faults": True}
+
+    async def _delay(median_ms: float) -> None:
+        if median_ms <= 0:
+            return
+        ms = median_ms * (rng.lognormvariate(0.0, profile.latency_sigma) if profile.latency_sigma > 0 else 1.0)
+        await asyncio.sleep(ms / 1000.0)
+
+    def _fault():
+        if not state["faults"]:
+            return None
+        roll = rng.random()
+        if roll < profile.rate_limit_rate:
+            counters["rate_limited"] += 1
+            return JSONResponse({"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                                status_code=429, headers={"Retry-After": f"{profile.retry_after_s:g}"})
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            counters["errors"] += 1
+            return JSONResponse({"error": {"message": "Injected failure", "type": "server_error"}},
+                                status_code=500)
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["chat"] += 1
+        await _delay(profile.chat_latency_ms)
+        fault = _fault()
+        if fault is not None:
+            return fault
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        content = json.dumps(chat_reply(prompt))
+        return {
+            "id": f"chatcmpl-{counters['chat']}",
+            "object": "chat.completion",
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        counters["embeddings"] += 1
+        counters["embedded_inputs"] += len(inputs)
+        await _delay(profile.embed_latency_ms)
+        fault = _fault()
+        if fault is not None:
+            return fault
+        dims = int(body.get("dimensions") or DEFAULT_DIMENSIONS)
+        return {
+            "object": "list",
+            "model": body.get("model", "fake"),
+            "data": [{"object": "embedding", "index": i, "embedding": fake_embedding(t, dims)}
+                     for i, t in enumerate(inputs)],
+            "usage": {"prompt_tokens": sum(len(t) // 4 for t in inputs),
+                      "total_tokens": sum(len(t) // 4 for t in inputs)},
+        }
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.put("/faults")
+    async def set_faults(request: Request):
+        """Toggle 429/5xx injection, e.g. off while seeding the corpus."""
+        state["faults"] = bool((await request.json()).get("enabled", True))
+        return state
+
+    @app.get("/stats")
+    async def stats():
+        return {"profile": asdict(profile), "faults_enabled": state["faults"], **counters}
+
+    return app
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FaultProfile()
+    parser.add_argument("--chat-latency-ms", type=float, default=defaults.chat_latency_ms,
+                        help="Median chat completion latency")
+    parser.add_argument("--embed-latency-ms", type=float, default=defaults.embed_latency_ms,
+                        help="Median embeddings request latency")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="Lognormal shape of both latency distributions (0 = fixed)")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Fraction of calls answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate,
+                        help="Fraction of calls answered with HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after_s,
+                        help="Retry-After seconds sent with injected 429s")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def profile_from_args(args: argparse.Namespace) -> FaultProfile:
+    return FaultProfile(
+        chat_latency_ms=args.chat_latency_ms,
+        embed_latency_ms=args.embed_latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat + embeddings server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAKE_OPENAI_PORT", "8900")))
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(profile_from_args(args)), host=args.host, port=args.port, log_level="warning")
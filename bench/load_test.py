@@ -0,0 +1,273 @@
+"""Offline end-to-end load benchmark: /upload -> /evaluate -> /result against local fakes.
+
+Starts the fake OpenAI server (``bench/fake_openai.py``) in a subprocess, seeds a
+throwaway local vector store with ``ingest_all --dir``, then serves the real
+FastAPI app in this process and drives it over HTTP at a fixed concurrency.
+
+    python -m bench.load_test --jobs 200 --concurrency 16 --chat-latency-ms 600
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from bench.fake_openai import add_profile_arguments
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TERMINAL = {"completed", "failed"}
+LAG_INTERVAL_S = 0.05
+
+
+@dataclass
+class JobSample:
+    status: str
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class LoopLagMonitor:
+    """Samples how late a periodic timer fires on the running loop."""
+    interval_s: float = LAG_INTERVAL_S
+    samples_ms: List[float] = field(default_factory=list)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval_s)
+            self.samples_ms.append(max(0.0, (loop.time() - start - self.interval_s) * 1000.0))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(pct / 100.0 * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_http(url: str, timeout_s: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout_s:.0f}s")
+
+
+def start_fake_openai(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "bench.fake_openai", "--port", str(port),
+           "--chat-latency-ms", str(args.chat_latency_ms),
+           "--embed-latency-ms", str(args.embed_latency_ms),
+           "--latency-sigma", str(args.latency_sigma),
+           "--error-rate", str(args.error_rate),
+           "--rate-limit-rate", str(args.rate_limit_rate),
+           "--retry-after", str(args.retry_after),
+           "--seed", str(args.seed)]
+    proc = subprocess.Popen(cmd, cwd=ROOT)
+    _wait_http(f"http://127.0.0.1:{port}/health")
+    return proc
+
+
+def bench_environment(workdir: str, fake_url: str, with_openrouter: bool = False) -> Dict[str, str]:
+    """Settings overrides that keep every store inside `workdir` and every provider call local."""
+    return {
+        "OPENAI_API_KEY": "bench-key",
+        "OPENAI_BASE_URL": f"{fake_url}/v1",
+        "OPENROUTER_API_KEY": "bench-key" if with_openrouter else "",
+        "OPENROUTER_BASE_URL": f"{fake_url}/v1",
+        "VECTOR_BACKEND": "local",
+        "VECTOR_STORE_PATH": os.path.join(workdir, "vector_store"),
+        "SQLITE_PATH": os.path.join(workdir, "app.sqlite3"),
+        "STORAGE_DIR": os.path.join(workdir, "storage"),
+        "EMBED_CACHE_PATH": os.path.join(workdir, "embedding_cache.sqlite3"),
+        "EVAL_LOG_PATH": os.path.join(workdir, "evaluation.log"),
+        "LOG_LEVEL": "WARNING",
+    }
+
+
+def seed_corpus(corpus_dir: str, default_brief: Optional[str]) -> None:
+    cmd = [sys.executable, "-m", "ingest.ingest_all", "--dir", corpus_dir]
+    if default_brief:
+        cmd += ["--brief", default_brief]
+    subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+
+async def run_job(client: httpx.AsyncClient, job_title: str, cv: tuple, report: tuple,
+                  force_refresh: bool) -> JobSample:
+    start = time.perf_counter()
+    try:
+        r = await client.post("/upload", files={"cv": cv, "report": report})
+        r.raise_for_status()
+        ids = r.json()
+        body = {"job_title": job_title, "cv_id": ids["cv_id"], "report_id": ids["report_id"],
+                "force_refresh": force_refresh}
+        while True:
+            r = await client.post("/evaluate", json=body)
+            if r.status_code != 429:
+                break
+            await asyncio.sleep(float(r.headers.get("Retry-After", "1")))
+        r.raise_for_status()
+        job = r.json()
+        while job["status"] not in TERMINAL:
+            r = await client.get(f"/result/{job['id']}", params={"wait": 30})
+            r.raise_for_status()
+            job = r.json()
+        return JobSample(job["status"], time.perf_counter() - start, job.get("error"))
+    except httpx.HTTPError as exc:
+        return JobSample("error", time.perf_counter() - start, repr(exc))
+
+
+async def drive(args: argparse.Namespace, app_port: int, fake_url: str) -> Dict:
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=app_port,
+                                           log_level="warning", lifespan="on"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        if serve_task.done():
+            serve_task.result()
+        await asyncio.sleep(0.05)
+
+    cvs = [(os.path.basename(p), open(p, "rb").read(), "application/pdf") for p in args.cv]
+    reports = [(os.path.basename(p), open(p, "rb").read(), "application/pdf") for p in args.report]
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    monitor = LoopLagMonitor()
+    lag_task = asyncio.create_task(monitor.run())
+    samples: List[JobSample] = []
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int) -> None:
+        async with slots:
+            samples.append(await run_job(client, args.job_title, cvs[i % len(cvs)],
+                                         reports[i % len(reports)], not args.allow_result_cache))
+
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", timeout=120.0,
+                                     limits=limits) as client:
+            if args.warmup:
+                await asyncio.gather(*(one(i) for i in range(args.warmup)))
+                samples.clear()
+                monitor.samples_ms.clear()
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.jobs)))
+            wall = time.perf_counter() - started
+            fake_stats = (await client.get(f"{fake_url}/stats")).json()
+    finally:
+        lag_task.cancel()
+        server.should_exit = True
+        await serve_task
+
+    return summarize(samples, wall, monitor.samples_ms, args, fake_stats)
+
+
+def summarize(samples: List[JobSample], wall: float, lag_ms: List[float],
+              args: argparse.Namespace, fake_stats: Dict) -> Dict:
+    done = [s.seconds for s in samples if s.status == "completed"]
+    errors = sorted({s.error for s in samples if s.status != "completed" and s.error})
+    return {
+        "jobs": len(samples),
+        "completed": len(done),
+        "failed": len(samples) - len(done),
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 3),
+        "jobs_per_second": round(len(done) / wall, 3) if wall > 0 else 0.0,
+        "latency_seconds": {f"p{p}": round(percentile(done, p), 3) for p in (50, 95, 99)},
+        "loop_lag_ms": {"p50": round(percentile(lag_ms, 50), 2), "p99": round(percentile(lag_ms, 99), 2),
+                        "max": round(max(lag_ms, default=0.0), 2)},
+        "fake_openai": fake_stats,
+        "sample_errors": errors[:5],
+    }
+
+
+def print_report(report: Dict) -> None:
+    lat, lag = report["latency_seconds"], report["loop_lag_ms"]
+    fake = report["fake_openai"]
+    print(f"jobs={report['jobs']} completed={report['completed']} failed={report['failed']} "
+          f"concurrency={report['concurrency']} wall={report['wall_seconds']:.2f}s")
+    print(f"throughput: {report['jobs_per_second']:.2f} jobs/s")
+    print(f"end-to-end latency: p50={lat['p50']:.3f}s p95={lat['p95']:.3f}s p99={lat['p99']:.3f}s")
+    print(f"event-loop lag: p50={lag['p50']:.2f}ms p99={lag['p99']:.2f}ms max={lag['max']:.2f}ms")
+    print(f"fake provider: chat={fake['chat']} embeddings={fake['embeddings']} "
+          f"429s={fake['rate_limited']} 5xx={fake['errors']}")
+    for err in report["sample_errors"]:
+        print(f"  error: {err}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline load benchmark for the evaluation API")
+    parser.add_argument("--jobs", type=int, default=50, help="Evaluations to run (after warm-up)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Evaluations in flight at once")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured evaluations run first")
+    parser.add_argument("--job-title", default="Product Engineer Backend")
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "data"),
+                        help="Directory of <Role>_{JobDesc,CaseStudy,Rubric}.pdf bundles to seed")
+    parser.add_argument("--brief", default=os.path.join(ROOT, "data", "Product_Engineer_Backend_CaseStudy.pdf"),
+                        help="Fallback case study for roles without one")
+    parser.add_argument("--cv", nargs="+", default=sorted(glob.glob(os.path.join(ROOT, "data", "cv", "*.pdf"))))
+    parser.add_argument("--report", nargs="+",
+                        default=sorted(glob.glob(os.path.join(ROOT, "data", "report", "*.pdf"))))
+    parser.add_argument("--allow-result-cache", action="store_true",
+                        help="Let identical submissions hit the result cache (default: force_refresh)")
+    parser.add_argument("--with-openrouter", action="store_true",
+                        help="Also configure OpenRouter (served by the same fake) to exercise hedging/failover")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON to this path")
+    parser.add_argument("--keep-workdir", action="store_true",
+                        help="Keep the temporary database, uploads and vector store")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if not args.cv or not args.report:
+        parser.error("no CV or report PDFs found; pass --cv and --report")
+
+    workdir = tempfile.mkdtemp(prefix="cv-eval-bench-")
+    fake_port, app_port = _free_port(), _free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    fake = start_fake_openai(fake_port, args)
+    try:
+        # Settings are read at import time, so the overrides must be in place
+        # before the seeding subprocess starts and before the app is imported.
+        os.environ.update(bench_environment(workdir, fake_url, args.with_openrouter))
+        httpx.put(f"{fake_url}/faults", json={"enabled": False}).raise_for_status()
+        seed_corpus(args.corpus, args.brief)
+        httpx.put(f"{fake_url}/faults", json={"enabled": True}).raise_for_status()
+        report = asyncio.run(drive(args, app_port, fake_url))
+    finally:
+        fake.terminate()
+        fake.wait(timeout=10)
+        if args.keep_workdir:
+            print(f"workdir kept at {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "json_path"}, **report}, f, indent=2)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Literal
 
 class UploadResponse(BaseModel):
     cv_id: Optional[str] = None
@@ -9,9 +9,35 @@ class EvaluateRequest(BaseModel):
     job_title: str = Field(...)
     cv_id: str
     report_id: str
+    priority: Literal["interactive", "bulk"] = "interactive"
+    force_refresh: bool = False
 
 class JobStatusResponse(BaseModel):
     id: str
     status: str
     result: Optional[Dict] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    queue_position: Optional[int] = None
+    queue_depth: Optional[int] = None
+    queue_wait_ms: Optional[float] = None
+    stage: Optional[str] = None
+
+class BatchItem(BaseModel):
+    cv_id: str
+    report_id: str
+
+class EvaluateBatchRequest(BaseModel):
+    job_title: str = Field(...)
+    items: List[BatchItem] = Field(..., min_length=1, max_length=500)
+    force_refresh: bool = False
+
+class BatchStatusResponse(BaseModel):
+    id: str
+    status: str
+    total: int
+    queued: int = 0
+    processing: int = 0
+    completed: int = 0
+    failed: int = 0
+    job_ids: List[str] = []
+    error: Optional[str] = None
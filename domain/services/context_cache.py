@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.settings import settings
+from infra.repositories.corpus_repository import AsyncCorpusRepository
+
+
+def _norm_title(job_title: str) -> str:
+    return " ".join(job_title.lower().split())
+
+
+class ReferenceContextCache:
+    """In-memory cache of per-job reference context, invalidated by the corpus version.
+
+    Job titles map to their resolved (job_key, tags); reference stage outputs
+    are keyed by (job_key, query, k, radius, corpus version). The version is
+    re-read from SQLite at most every `version_ttl` seconds, so a re-ingest is
+    picked up shortly after `ingest_all.py` bumps it.
+    """
+
+    def __init__(self, max_items: int, version_ttl: float) -> None:
+        self._max_items = max(1, max_items)
+        self._version_ttl = version_ttl
+        self._corpus = AsyncCorpusRepository()
+        self._version: Optional[int] = None
+        self._version_checked = 0.0
+        self._titles: "OrderedDict[Tuple, Tuple[str, Optional[List[str]]]]" = OrderedDict()
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def corpus_version(self) -> int:
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked >= self._version_ttl:
+            version = await self._corpus.get_version()
+            if version != self._version:
+                self._titles.clear()
+                self._entries.clear()
+            self._version, self._version_checked = version, now
+        return self._version
+
+    def _put(self, store: OrderedDict, key, value) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self._max_items:
+            store.popitem(last=False)
+
+    @staticmethod
+    def _entry_key(job_title: str, job_key: str, job_tags: Optional[List[str]],
+                   k: int, radius: int, version: int) -> Tuple:
+        query = (_norm_title(job_title), tuple(job_tags or ()))
+        return (job_key, query, k, radius, version)
+
+    async def get_resolution(self, job_title: str) -> Optional[Tuple[str, Optional[List[str]]]]:
+        key = (_norm_title(job_title), await self.corpus_version())
+        resolved = self._titles.get(key)
+        if resolved is not None:
+            self._titles.move_to_end(key)
+        return resolved
+
+    async def put_resolution(self, job_title: str, resolved: Tuple[str, Optional[List[str]]]) -> None:
+        self._put(self._titles, (_norm_title(job_title), await self.corpus_version()), resolved)
+
+    async def get(self, job_title: str, k: int, radius: int) -> Optional[Dict]:
+        """Cached reference stage outputs (including `resolve`) for `job_title`, if warm."""
+        resolved = await self.get_resolution(job_title)
+        if resolved is not None:
+            key = self._entry_key(job_title, *resolved, k, radius, self._version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return {"resolve": resolved, **entry}
+        self.misses += 1
+        return None
+
+    async def put(self, job_title: str, k: int, radius: int, context: Dict) -> None:
+        version = await self.corpus_version()
+        resolved = context["resolve"]
+        self._put(self._titles, (_norm_title(job_title), version), resolved)
+        entry = {name: value for name, value in context.items() if name != "resolve"}
+        self._put(self._entries, self._entry_key(job_title, *resolved, k, radius, version), entry)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "corpus_version": self._version,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+reference_cache = ReferenceContextCache(
+    max_items=settings.REFERENCE_CACHE_MAX_ITEMS,
+    version_ttl=settings.CORPUS_VERSION_TTL_SECONDS,
+)
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from infra.pdf.extraction import pdf_extractor
+from infra.repositories.documents_repository import AsyncDocumentTextsRepository
+
+logger = logging.getLogger(__name__)
+docs_repo = AsyncDocumentTextsRepository()
+
+# content_hash -> in-flight extraction, so uploads and evaluations share one parse.
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def _extract_and_store(path: str, content_hash: str) -> str:
+    text, page_count = await pdf_extractor.extract_document(path)
+    await docs_repo.save(content_hash, text, page_count)
+    logger.info("Cached text for %s (%d pages, %d chars)", content_hash[:12], page_count, len(text))
+    return text
+
+
+def _extraction_task(path: str, content_hash: str) -> asyncio.Task:
+    task = _inflight.get(content_hash)
+    if task is None:
+        task = asyncio.create_task(_extract_and_store(path, content_hash))
+        _inflight[content_hash] = task
+        task.add_done_callback(lambda _: _inflight.pop(content_hash, None))
+    return task
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception():
+        logger.warning("Background text extraction failed: %s", task.exception())
+
+
+async def schedule_extraction(path: str, content_hash: str) -> None:
+    """Start background text extraction for a freshly uploaded file."""
+    if content_hash in _inflight or await docs_repo.get(content_hash):
+        return
+    task = _extraction_task(path, content_hash)
+    task.add_done_callback(_log_failure)
+
+
+async def load_document_text(path: str, content_hash: Optional[str] = None) -> str:
+    """Cached text for `content_hash` if available, otherwise extract (and cache) it now."""
+    if not content_hash:
+        return await pdf_extractor.extract_text(path)
+    cached = await docs_repo.get(content_hash)
+    if cached:
+        return cached["text"]
+    return await asyncio.shield(_extraction_task(path, content_hash))
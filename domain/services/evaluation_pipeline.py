@@ -1,14 +1,20 @@
 import re
 import json
 import logging
-from typing import Dict, List, Optional
-
-from infra.pdf.parser import parse_pdf_text
+from typing import Callable, Dict, List, Optional
+
+from domain.services.context_cache import reference_cache
+from domain.services.stage_graph import StageGraph
+from domain.services.document_text import load_document_text
+from app.logging import evaluation_log_handler
+from app.settings import settings
+from infra.metrics.instruments import EVALUATION_SECONDS
+from infra.rag.context_packer import estimate_tokens, pack_references
 from infra.rag.retriever import (
-    retrieve_for_cv,
-    retrieve_for_project,
     resolve_job_key,
-    retrieve_rubrics,
+    search_brief_blocks,
+    search_jd_blocks,
+    search_rubric_blocks,
 )
 from infra.llm.client import (
     evaluate_cv_llm,
@@ -16,14 +22,11 @@ from infra.llm.client import (
     summarize_overall_llm,
 )
 
+# JSON lines written by a background thread; verbose payload dumps are DEBUG only.
 logger = logging.getLogger("evaluation_pipeline")
-logger.setLevel(logging.INFO)
-fh = logging.FileHandler("evaluation_debug.log", mode="a", encoding="utf-8")
-fh.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-fh.setFormatter(formatter)
+logger.setLevel(getattr(logging, settings.EVAL_LOG_LEVEL.upper(), logging.INFO))
 if not logger.handlers:
-    logger.addHandler(fh)
+    logger.addHandler(evaluation_log_handler())
 
 
 def redact_numeric_examples(text: str) -> str:
@@ -39,90 +42,195 @@ def sanitize_refs(refs: List[str]) -> List[str]:
     return [redact_numeric_examples(r) for r in refs]
 
 
-async def run_evaluation(job_title: str, cv_path: str, report_path: str) -> Dict:
-    logger.info("=== Starting evaluation job ===")
-    logger.info(f"Job title: {job_title}")
-    logger.info(f"CV path: {cv_path}")
-    logger.info(f"Report path: {report_path}")
+def sanitize_blocks(blocks: List[Dict]) -> List[Dict]:
+    return [{**b, "text": redact_numeric_examples(b["text"])} for b in blocks]
+
+
+async def resolve_job(job_title: str):
+    cached = await reference_cache.get_resolution(job_title)
+    if cached is not None:
+        return cached
 
     job_key, confidence, candidates = await resolve_job_key(job_title)
     job_tags: Optional[List[str]] = None
 
     if not job_key:
         job_key = job_title.strip().lower().replace(" ", "-")
-        logger.warning(
-            f"Could not confidently resolve job_key (best similarity={confidence:.3f}). "
-            f"Falling back to '{job_key}'. Candidates={candidates}"
-        )
+        logger.warning("Could not confidently resolve job_key (best similarity=%.3f); falling back to '%s'",
+                       confidence, job_key)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Job key candidates: %s", candidates)
     else:
         top = max(candidates, key=lambda x: x["similarity"])
         job_tags = top.get("tags", [])
-        logger.info(
-            f"Resolved job_key: {job_key} "
-            f"(similarity={confidence:.3f}, tags={job_tags})"
+        logger.info("Resolved job_key: %s (similarity=%.3f, tags=%s)", job_key, confidence, job_tags)
+    await reference_cache.put_resolution(job_title, (job_key, job_tags))
+    return job_key, job_tags
+
+
+def _debug_previews(label: str, texts: List[str]) -> None:
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, text in enumerate(texts[:3]):
+            logger.debug("%s ref %d: %s...", label, i + 1, text[:200])
+
+
+# Stages whose outputs depend only on the job title; shared across candidates.
+REFERENCE_STAGES = ("resolve", "rubrics", "jd_blocks", "brief_blocks", "cv_refs", "proj_refs")
+REFERENCE_K = 5
+REFERENCE_RADIUS = 1
+
+
+def _build_graph(
+    job_title: str,
+    cv_path: Optional[str] = None,
+    report_path: Optional[str] = None,
+    cv_hash: Optional[str] = None,
+    report_hash: Optional[str] = None,
+) -> StageGraph:
+    """Full evaluation graph, or only the reference stages when no documents are given."""
+    g = StageGraph()
+
+    async def resolve(r):
+        return await resolve_job(job_title)
+
+    async def parse_cv(r):
+        text = await load_document_text(cv_path, cv_hash)
+        logger.info("CV text length: %d chars", len(text))
+        return text
+
+    async def parse_report(r):
+        text = await load_document_text(report_path, report_hash)
+        logger.info("Report text length: %d chars", len(text))
+        return text
+
+    async def rubrics(r):
+        job_key, _ = r["resolve"]
+        logger.info("Retrieving shared rubric content")
+        blocks = await search_rubric_blocks(job_key=job_key, k=REFERENCE_K, radius=REFERENCE_RADIUS)
+        logger.info("Retrieved %d rubric blocks", len(blocks))
+        _debug_previews("Rubrics", [b["text"] for b in blocks])
+        return blocks
+
+    # JD and case-brief retrieval run alongside the rubric lookup; the rubric
+    # blocks are combined with them in the *_refs stages below.
+    async def jd_blocks(r):
+        job_key, job_tags = r["resolve"]
+        logger.info("Retrieving job description references for CV")
+        return await search_jd_blocks(
+            job_key=job_key,
+            job_title=job_title,
+            job_tags=job_tags,
+            k=REFERENCE_K,
+            radius=REFERENCE_RADIUS,
+        )
+
+    async def brief_blocks(r):
+        job_key, job_tags = r["resolve"]
+        logger.info("Retrieving case brief + rubric references for project")
+        return await search_brief_blocks(
+            job_key=job_key,
+            job_title=job_title,
+            job_tags=job_tags,
+            k=REFERENCE_K,
+            radius=REFERENCE_RADIUS,
         )
 
-    cv_text = parse_pdf_text(cv_path)
-    report_text = parse_pdf_text(report_path)
-    logger.info(f"CV text length: {len(cv_text)} chars")
-    logger.info(f"Report text length: {len(report_text)} chars")
-
-    logger.info("Retrieving shared rubric content")
-    rubric_blocks = await retrieve_rubrics(job_key=job_key, k=5, radius=1)
-    logger.info(f"Retrieved {len(rubric_blocks)} rubric blocks")
-    for i, ref in enumerate(rubric_blocks[:3]):
-        logger.info(f"Rubrics ref {i+1}: {ref[:200] }...")
-
-    logger.info("Retrieving job description references for CV")
-    cv_refs: List[str] = await retrieve_for_cv(
-        job_key=job_key,
-        job_title=job_title,
-        job_tags=job_tags,
-        k=5,
-        radius=1,
-        rubric_blocks=rubric_blocks,
-    )
-    cv_refs = sanitize_refs(cv_refs)
-    logger.info(f"Retrieved {len(cv_refs)} CV references")
-    for i, ref in enumerate(cv_refs[:3]):
-        logger.info(f"CV ref {i+1}: {ref[:200] }...")
-
-    logger.info("Retrieving case brief + rubric references for project")
-    proj_refs: List[str] = await retrieve_for_project(
-        job_key=job_key,
-        job_title=job_title,
-        job_tags=job_tags,
-        k=5,
-        radius=1,
-        rubric_blocks=rubric_blocks,
-    )
-    proj_refs = sanitize_refs(proj_refs)
-    logger.info(f"Retrieved {len(proj_refs)} project references")
-    for i, ref in enumerate(proj_refs[:3]):
-        logger.info(f"Project ref {i+1}: {ref[:200] }...")
-
-    #  Evaluate with LLMs
-    logger.info("Calling LLM for CV evaluation")
-    cv_eval = await evaluate_cv_llm(cv_text=cv_text, refs=cv_refs)
-    logger.info(
-        "CV evaluation result: "
-        f"match_rate={cv_eval.get('cv_match_rate')} feedback_preview={str(cv_eval.get('cv_feedback'))}"
-    )
-
-    logger.info("Calling LLM for Project evaluation")
-    project_eval = await evaluate_project_llm(report_text=report_text, refs=proj_refs)
-    logger.info(
-        "Project evaluation result: "
-        f"score={project_eval.get('project_score')} feedback_preview={str(project_eval.get('project_feedback'))}"
-    )
-
-    #  Summarize
-    logger.info("Calling LLM for overall summary synthesis")
-    summary = await summarize_overall_llm(cv_eval=cv_eval, project_eval=project_eval)
-    logger.info(
-        "Overall summary preview: "
-        f"{summary.get('overall_summary', '')}"
-    )
+    # Reference lists are de-duplicated and packed into a per-stage token budget.
+    async def cv_refs(r):
+        refs = pack_references(sanitize_blocks(r["jd_blocks"] + r["rubrics"]), settings.CV_REF_TOKEN_BUDGET)
+        logger.info("Packed %d CV references (~%d tokens)", len(refs), sum(map(estimate_tokens, refs)))
+        _debug_previews("CV", refs)
+        return refs
+
+    async def proj_refs(r):
+        refs = pack_references(sanitize_blocks(r["rubrics"] + r["brief_blocks"]), settings.PROJECT_REF_TOKEN_BUDGET)
+        logger.info("Packed %d project references (~%d tokens)", len(refs), sum(map(estimate_tokens, refs)))
+        _debug_previews("Project", refs)
+        return refs
+
+    async def cv_eval(r):
+        logger.info("Calling LLM for CV evaluation")
+        out = await evaluate_cv_llm(cv_text=r["parse_cv"], refs=r["cv_refs"])
+        logger.info("CV evaluation result: match_rate=%s", out.get("cv_match_rate"))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CV feedback: %s", out.get("cv_feedback"))
+        return out
+
+    async def project_eval(r):
+        logger.info("Calling LLM for Project evaluation")
+        out = await evaluate_project_llm(report_text=r["parse_report"], refs=r["proj_refs"])
+        logger.info("Project evaluation result: score=%s", out.get("project_score"))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Project feedback: %s", out.get("project_feedback"))
+        return out
+
+    async def summary(r):
+        logger.info("Calling LLM for overall summary synthesis")
+        out = await summarize_overall_llm(cv_eval=r["cv_eval"], project_eval=r["project_eval"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Overall summary: %s", out.get("overall_summary", ""))
+        return out
+
+    g.add("resolve", resolve, lane="retrieval")
+    g.add("rubrics", rubrics, deps=["resolve"], lane="retrieval")
+    g.add("jd_blocks", jd_blocks, deps=["resolve"], lane="retrieval")
+    g.add("brief_blocks", brief_blocks, deps=["resolve"], lane="retrieval")
+    g.add("cv_refs", cv_refs, deps=["jd_blocks", "rubrics"])
+    g.add("proj_refs", proj_refs, deps=["rubrics", "brief_blocks"])
+    if cv_path is None or report_path is None:
+        return g
+
+    g.add("parse_cv", parse_cv, lane="pdf")
+    g.add("parse_report", parse_report, lane="pdf")
+    g.add("cv_eval", cv_eval, deps=["parse_cv", "cv_refs"], lane="llm")
+    g.add("project_eval", project_eval, deps=["parse_report", "proj_refs"], lane="llm")
+    g.add("summary", summary, deps=["cv_eval", "project_eval"], lane="llm")
+    return g
+
+
+async def prepare_reference_context(job_title: str) -> Dict:
+    """Resolve the job and retrieve all reference blocks once, for reuse across candidates."""
+    logger.info("Preparing shared reference context for: %s", job_title)
+    cached = await reference_cache.get(job_title, REFERENCE_K, REFERENCE_RADIUS)
+    if cached is not None:
+        return cached
+    r = await _build_graph(job_title).run()
+    context = {name: r[name] for name in REFERENCE_STAGES}
+    await reference_cache.put(job_title, REFERENCE_K, REFERENCE_RADIUS, context)
+    return context
+
+
+async def run_evaluation(
+    job_title: str,
+    cv_path: str,
+    report_path: str,
+    cv_hash: Optional[str] = None,
+    report_hash: Optional[str] = None,
+    context: Optional[Dict] = None,
+    on_stage: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """Evaluate one candidate. `context` from `prepare_reference_context` skips retrieval.
+
+    Without a full context, a warm reference cache entry for the job title is
+    used instead. `on_stage` is called with each pipeline stage name as it starts.
+    """
+    logger.info("Starting evaluation: job_title=%s cv=%s report=%s", job_title, cv_path, report_path)
+
+    with EVALUATION_SECONDS.time(outcome="error") as labels:
+        retrieve = not context or not all(name in context for name in REFERENCE_STAGES)
+        if retrieve:
+            cached = await reference_cache.get(job_title, REFERENCE_K, REFERENCE_RADIUS)
+            if cached is not None:
+                logger.info("Reference context cache hit; skipping retrieval")
+                context, retrieve = {**(context or {}), **cached}, False
+
+        r = await _build_graph(job_title, cv_path, report_path, cv_hash, report_hash).run(initial=context, on_start=on_stage)
+        if retrieve:
+            await reference_cache.put(job_title, REFERENCE_K, REFERENCE_RADIUS,
+                                      {name: r[name] for name in REFERENCE_STAGES})
+        labels["outcome"] = "ok"
+    job_key, _ = r["resolve"]
+    cv_eval, project_eval, summary = r["cv_eval"], r["project_eval"], r["summary"]
 
     result = {
         "cv_match_rate": float(cv_eval.get("cv_match_rate", 0.0) or 0.0),
@@ -133,6 +241,8 @@ async def run_evaluation(job_title: str, cv_path: str, report_path: str) -> Dict
         "job_key": job_key,
     }
 
-    logger.info(f"Final combined result:\n{json.dumps(result, indent=2)}")
-    logger.info("=== Evaluation job completed ===\n")
+    logger.info("Evaluation completed: job_key=%s cv_match_rate=%.2f project_score=%.1f",
+                job_key, result["cv_match_rate"], result["project_score"])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final combined result: %s", json.dumps(result, indent=2))
     return result
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+
+TERMINAL_STAGES = {"completed", "failed"}
+
+# Internal pipeline stage -> public progress stage.
+PIPELINE_STAGES = {
+    "resolve": "retrieving",
+    "rubrics": "retrieving",
+    "jd_blocks": "retrieving",
+    "brief_blocks": "retrieving",
+    "parse_cv": "parsing",
+    "parse_report": "parsing",
+    "cv_eval": "cv_eval",
+    "project_eval": "project_eval",
+    "summary": "summarizing",
+}
+
+
+class JobEventBus:
+    """In-process fan-out of job stage transitions to SSE streams and long-polls."""
+
+    def __init__(self, retain: int = 10_000) -> None:
+        self._retain = retain
+        self._last: "OrderedDict[str, Dict]" = OrderedDict()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._seq = 0
+
+    def publish(self, job_id: str, stage: str, **data) -> Dict:
+        self._seq += 1
+        event = {"job_id": job_id, "stage": stage, "seq": self._seq, "ts": time.time(), **data}
+        self._last[job_id] = event
+        self._last.move_to_end(job_id)
+        while len(self._last) > self._retain:
+            self._last.popitem(last=False)
+        for q in self._subscribers.get(job_id, ()):
+            q.put_nowait(event)
+        return event
+
+    def last(self, job_id: str) -> Optional[Dict]:
+        return self._last.get(job_id)
+
+    def stage_reporter(self, job_id: str):
+        """Callback for `run_evaluation(on_stage=...)` that publishes each public stage once."""
+        seen: Set[str] = set()
+
+        def report(stage_name: str) -> None:
+            stage = PIPELINE_STAGES.get(stage_name)
+            if stage and stage not in seen:
+                seen.add(stage)
+                self.publish(job_id, stage)
+        return report
+
+    @contextmanager
+    def subscribe(self, job_id: str) -> Iterator[asyncio.Queue]:
+        q: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(q)
+        try:
+            yield q
+        finally:
+            subs = self._subscribers.get(job_id)
+            if subs is not None:
+                subs.discard(q)
+                if not subs:
+                    del self._subscribers[job_id]
+
+    async def wait_for_change(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Next event for `job_id`, or None if nothing happens within `timeout` seconds."""
+        with self.subscribe(job_id) as q:
+            try:
+                return await asyncio.wait_for(q.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+
+
+job_events = JobEventBus()
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+LANES = ("interactive", "bulk")
+
+
+class QueueFullError(Exception):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("evaluation queue is full")
+        self.retry_after = retry_after
+
+
+class SchedulerUnavailableError(Exception):
+    pass
+
+
+@dataclass
+class _QueuedJob:
+    job_id: str
+    lane: str
+    fn: Callable[[], Awaitable[None]]
+    enqueued_at: float
+
+
+class JobScheduler:
+    """Bounded in-process queue drained by a fixed worker pool.
+
+    Interactive jobs are served first, but every `bulk_every`-th pick goes to
+    the bulk lane when both have work so bulk screens cannot starve.
+    """
+
+    def __init__(self, workers: int, max_queue: int, bulk_every: int = 4) -> None:
+        self._workers_n = max(1, workers)
+        self._max_queue = max(1, max_queue)
+        self._bulk_every = max(1, bulk_every)
+        self._lanes: Dict[str, Deque[_QueuedJob]] = {lane: deque() for lane in LANES}
+        self._workers: List[asyncio.Task] = []
+        self._ready: Optional[asyncio.Semaphore] = None  # one permit per queued job
+        self._picks = 0
+        self._running = 0
+        self._avg_service_s = 10.0
+        self._waits_ms: "OrderedDict[str, float]" = OrderedDict()
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._ready = asyncio.Semaphore(0)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self._workers_n)
+        ]
+
+    async def close(self) -> None:
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._ready = None
+
+    def depth(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def max_queue(self) -> int:
+        return self._max_queue
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.depth() * self._avg_service_s / self._workers_n))
+
+    def check_capacity(self, slots: int = 1) -> None:
+        """Raise before any job state is created if submitting `slots` jobs would be rejected."""
+        if self._ready is None:
+            raise SchedulerUnavailableError("job scheduler is not running")
+        if self.depth() + slots > self._max_queue:
+            raise QueueFullError(self.retry_after())
+
+    def submit(self, job_id: str, fn: Callable[[], Awaitable[None]], lane: str = "interactive") -> int:
+        if lane not in self._lanes:
+            raise ValueError(f"unknown lane: {lane}")
+        self.check_capacity()
+        self._lanes[lane].append(_QueuedJob(job_id, lane, fn, time.monotonic()))
+        self._ready.release()
+        return self.position(job_id) or 0
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position in dequeue order (interactive lane ahead of bulk)."""
+        offset = 0
+        for lane in LANES:
+            for i, item in enumerate(self._lanes[lane]):
+                if item.job_id == job_id:
+                    return offset + i + 1
+            offset += len(self._lanes[lane])
+        return None
+
+    def queue_wait_ms(self, job_id: str) -> Optional[float]:
+        for q in self._lanes.values():
+            for item in q:
+                if item.job_id == job_id:
+                    return round((time.monotonic() - item.enqueued_at) * 1000, 1)
+        return self._waits_ms.get(job_id)
+
+    def _pop(self) -> Optional[_QueuedJob]:
+        interactive, bulk = self._lanes["interactive"], self._lanes["bulk"]
+        self._picks += 1
+        if bulk and (not interactive or self._picks % self._bulk_every == 0):
+            return bulk.popleft()
+        if interactive:
+            return interactive.popleft()
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            await self._ready.acquire()
+            item = self._pop()
+            if item is None:
+                continue
+            started = time.monotonic()
+            self._waits_ms[item.job_id] = round((started - item.enqueued_at) * 1000, 1)
+            while len(self._waits_ms) > 10_000:
+                self._waits_ms.popitem(last=False)
+            self._running += 1
+            try:
+                await item.fn()
+            except Exception:
+                logger.exception("Scheduled job %s crashed", item.job_id)
+            finally:
+                self._running -= 1
+                elapsed = time.monotonic() - started
+                self._avg_service_s = 0.8 * self._avg_service_s + 0.2 * elapsed
+
+
+job_scheduler = JobScheduler(
+    workers=settings.SCHEDULER_WORKERS,
+    max_queue=settings.SCHEDULER_MAX_QUEUE,
+    bulk_every=settings.SCHEDULER_BULK_EVERY,
+)
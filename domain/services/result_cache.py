@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from infra.llm.client import active_model_name, track_llm_models
+from infra.llm.prompts import PROMPT_VERSION
+from infra.rag.context_packer import packing_signature
+from infra.repositories.corpus_repository import AsyncCorpusRepository
+from infra.repositories.result_cache_repository import AsyncResultCacheRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Deterministic cache of full evaluation results with single-flight deduplication.
+
+    Keyed by (cv hash, report hash, job_key, model, prompt version, corpus
+    version); identical concurrent requests await one shared computation.
+    Lookups use the preferred provider's model. A result is stored under the
+    model(s) that actually answered, so a hedged or failed-over run is never
+    served as the preferred model's output.
+    """
+
+    def __init__(self) -> None:
+        self._repo = AsyncResultCacheRepository()
+        self._corpus = AsyncCorpusRepository()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+
+    async def make_key(self, cv_hash: Optional[str], report_hash: Optional[str], job_key: str,
+                       model: Optional[str] = None) -> Optional[str]:
+        model = model if model is not None else active_model_name()
+        if not (cv_hash and report_hash and model):
+            return None  # unhashed legacy uploads or stub (no-provider) results are never cached
+        raw = "|".join([cv_hash, report_hash, job_key, model, PROMPT_VERSION, packing_signature(),
+                        str(await self._corpus.get_version())])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def lookup(self, key: Optional[str]) -> Optional[Dict]:
+        if not key:
+            return None
+        result = await self._repo.get(key)
+        if result is not None:
+            self.hits += 1
+        return result
+
+    async def get_or_compute(
+        self,
+        key: Optional[str],
+        compute: Callable[[], Awaitable[Dict]],
+        force_refresh: bool = False,
+        key_for_model: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
+    ) -> Dict:
+        """Cached or freshly computed result for `key`.
+
+        `key_for_model(model)` rebuilds the key for another model; when given,
+        the result is stored under the models that produced it rather than `key`.
+        """
+        if not key:
+            return await compute()
+        if not force_refresh:
+            cached = await self.lookup(key)
+            if cached is not None:
+                return cached
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.coalesced += 1
+                return await asyncio.shield(inflight)
+        else:
+            self.refreshes += 1
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            try:
+                with track_llm_models() as used:
+                    result = await compute()
+            except BaseException as exc:
+                fut.set_exception(exc)
+                fut.exception()  # mark retrieved when nobody else is waiting
+                raise
+            fut.set_result(result)
+            # The in-flight entry stays until the write lands, so a new lookup finds one or the other.
+            await self._store(key, result, used, key_for_model)
+            return result
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    async def _store(self, key: str, result: Dict, used: Set[str],
+                     key_for_model: Optional[Callable[[str], Awaitable[Optional[str]]]]) -> None:
+        """Best-effort write: a failed cache write never fails the evaluation it caches."""
+        try:
+            store_key = key
+            if key_for_model is not None:
+                # Empty when only the stub answered; make_key then returns None and nothing is stored.
+                store_key = await key_for_model("+".join(sorted(used)))
+            if store_key:
+                await self._repo.put(store_key, result)
+        except Exception as e:
+            logger.warning("Result cache write failed for %s: %s", key, e)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "forced_refreshes": self.refreshes,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache()
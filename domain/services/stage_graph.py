@@ -0,0 +1,92 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.settings import settings
+from infra.metrics.instruments import PIPELINE_STAGE_SECONDS
+
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Process-wide caps shared by every running job, keyed by stage lane.
+_LANE_LIMITS = {
+    "pdf": settings.PIPELINE_PDF_CONCURRENCY,
+    "retrieval": settings.PIPELINE_RETRIEVAL_CONCURRENCY,
+    "llm": settings.PIPELINE_LLM_CONCURRENCY,
+}
+_lane_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _lane_semaphore(lane: Optional[str]) -> Optional[asyncio.Semaphore]:
+    if lane is None or lane not in _LANE_LIMITS:
+        return None
+    sem = _lane_semaphores.get(lane)
+    if sem is None:
+        sem = asyncio.Semaphore(max(1, _LANE_LIMITS[lane]))
+        _lane_semaphores[lane] = sem
+    return sem
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: StageFn
+    deps: Tuple[str, ...] = field(default_factory=tuple)
+    lane: Optional[str] = None
+
+
+class StageGraph:
+    """Tiny async DAG runner: each stage starts as soon as its dependencies finish."""
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, fn: StageFn, deps: Iterable[str] = (), lane: Optional[str] = None) -> None:
+        deps = tuple(deps)
+        for d in deps:
+            if d not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{d}'")
+        self._stages[name] = Stage(name=name, fn=fn, deps=deps, lane=lane)
+
+    async def run(
+        self,
+        initial: Optional[Dict[str, Any]] = None,
+        on_start: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Run all stages whose outputs are not already present in `initial`.
+
+        `on_start` is called with the stage name once its dependencies are met
+        and it has acquired its lane slot; the stage's latency is recorded from
+        that point on.
+        """
+        results: Dict[str, Any] = dict(initial or {})
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def _execute(stage: Stage) -> None:
+            if on_start:
+                on_start(stage.name)
+            with PIPELINE_STAGE_SECONDS.time(stage=stage.name, outcome="error") as labels:
+                results[stage.name] = await stage.fn(results)
+                labels["outcome"] = "ok"
+
+        async def _run(stage: Stage) -> None:
+            for d in stage.deps:
+                if d in tasks:
+                    await tasks[d]
+            sem = _lane_semaphore(stage.lane)
+            if sem is None:
+                await _execute(stage)
+            else:
+                async with sem:
+                    await _execute(stage)
+
+        for name, stage in self._stages.items():
+            if name not in results:
+                tasks[name] = asyncio.create_task(_run(stage), name=f"stage:{name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for t in tasks.values():
+                t.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return results
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, Integer, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from infra.db.session import Base
@@ -9,8 +9,27 @@ class FileRecord(Base):
     type = Column(String, nullable=False)   # 'cv' | 'report'
     path = Column(String, nullable=False)
     name = Column(String, nullable=False)
+    content_hash = Column(String, nullable=True, index=True)  # sha256 of file bytes
     created_at = Column(DateTime, server_default=func.now())
 
+class DocumentTextRecord(Base):
+    __tablename__ = "document_texts"
+    content_hash = Column(String, primary_key=True)
+    text = Column(Text, nullable=False)
+    page_count = Column(Integer, nullable=False)
+    char_count = Column(Integer, nullable=False)
+    word_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+class BatchRecord(Base):
+    __tablename__ = "batches"
+    id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, default="queued")
+    job_title = Column(String, nullable=False)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class JobRecord(Base):
     __tablename__ = "jobs"
     id = Column(String, primary_key=True)
@@ -18,10 +37,36 @@ class JobRecord(Base):
     job_title = Column(String, nullable=False)
     cv_file_id = Column(String, ForeignKey("files.id"), nullable=False)
     report_file_id = Column(String, ForeignKey("files.id"), nullable=False)
+    batch_id = Column(String, ForeignKey("batches.id"), nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     result = relationship("JobResultRecord", back_populates="job", uselist=False)
 
+class CorpusStateRecord(Base):
+    __tablename__ = "corpus_state"
+    id = Column(Integer, primary_key=True)  # single row, id=1
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class IngestManifestRecord(Base):
+    __tablename__ = "ingest_manifest"
+    collection = Column(String, primary_key=True)
+    job_key = Column(String, primary_key=True)  # "" for catalog entries (keyed by JD file)
+    doc_type = Column(String, primary_key=True)
+    source = Column(String, primary_key=True)
+    file_hash = Column(String, nullable=False)  # sha256 of the source file
+    params = Column(String, nullable=False)  # chunking parameters / catalog model
+    embedding_model = Column(String, nullable=False)
+    point_ids = Column(Text, nullable=False)  # JSON list of vector point ids
+    meta = Column(Text, nullable=True)  # catalog metadata JSON
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class ResultCacheRecord(Base):
+    __tablename__ = "result_cache"
+    key = Column(String, primary_key=True)
+    result = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, server_default=func.now())
+
 class JobResultRecord(Base):
     __tablename__ = "job_results"
     job_id = Column(String, ForeignKey("jobs.id"), primary_key=True)
@@ -1,17 +1,67 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.settings import settings
 
+
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    # WAL lets /result readers proceed while job writes commit; NORMAL is
+    # durable across app crashes in WAL mode and avoids an fsync per commit.
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-20000")
+    cur.close()
+
+
 engine = create_engine(
     f"sqlite:///{settings.SQLITE_PATH}", echo=False, future=True)
+event.listen(engine, "connect", _set_sqlite_pragmas)
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, future=True)
 
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{settings.SQLITE_PATH}",
+    echo=False,
+    # aiosqlite defaults to NullPool; keep connections (and their pragmas) warm.
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.SQLITE_POOL_SIZE,
+    max_overflow=settings.SQLITE_POOL_MAX_OVERFLOW,
+)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+def _add_missing_columns():
+    # create_all() never alters existing tables; add nullable columns introduced later.
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name not in existing and col.nullable:
+                    conn.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN {col.name} {col.type.compile(engine.dialect)}'))
+
+
 def init_db():
-    from infra.db.models import FileRecord, JobRecord, JobResultRecord
+    from infra.db.models import (
+        FileRecord, JobRecord, JobResultRecord, DocumentTextRecord, BatchRecord,
+        CorpusStateRecord, ResultCacheRecord, IngestManifestRecord,
+    )
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+async def close_db():
+    await async_engine.dispose()
@@ -0,0 +1,92 @@
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpPool:
+    """App-scoped ``httpx.AsyncClient`` shared by every outbound LLM / embedding call.
+
+    Opened on startup and closed on shutdown. Scripts that never start it
+    (e.g. ingestion) get a lazily created client on first use.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests = 0
+        self._new_connections = 0
+
+    def _build(self) -> httpx.AsyncClient:
+        http2 = settings.HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1")
+                http2 = False
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=http2,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            event_hooks={"request": [self._on_request]},
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self._requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._new_connections += 1
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._build()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = self._build()
+        return self._client
+
+    def stats(self) -> Dict:
+        in_use = idle = waiters = 0
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        if pool is not None:
+            for conn in pool.connections:
+                if conn.is_idle():
+                    idle += 1
+                else:
+                    in_use += 1
+            waiters = sum(1 for r in getattr(pool, "_requests", []) if r.is_queued())
+        reused = max(0, self._requests - self._new_connections)
+        return {
+            "open": self._client is not None,
+            "in_use_connections": in_use,
+            "idle_connections": idle,
+            "waiters": waiters,
+            "requests": self._requests,
+            "new_connections": self._new_connections,
+            "reuse_ratio": round(reused / self._requests, 4) if self._requests else 0.0,
+        }
+
+
+http_pool = HttpPool()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    return http_pool.client
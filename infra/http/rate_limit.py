@@ -0,0 +1,257 @@
+import asyncio
+import email.utils
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+import httpx
+
+from app.settings import settings
+
+# Statuses that mean "the provider is overloaded": shrink concurrency and back off.
+OVERLOAD_STATUSES = {408, 429, 500, 502, 503, 504}
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 20.0
+# Successive overload signals inside this window count as one congestion event.
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_retriable(status: int) -> bool:
+    return status >= 500 or status in {408, 429}
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Delay before retry `attempt` (1-based): the provider's Retry-After plus jitter, else jittered exponential."""
+    if retry_after is not None:
+        return retry_after + random.uniform(0.0, max(0.1, retry_after * 0.25))
+    ceiling = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0.0, ceiling / 2)
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute up to one minute's worth; waiters are served in order.
+
+    A request larger than the bucket waits for a full bucket and leaves it in
+    debt, so oversized requests are paced rather than rejected.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self._level = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    async def acquire(self, amount: float) -> float:
+        """Take `amount` units; returns seconds spent waiting."""
+        waited = 0.0
+        async with self._lock:
+            need = min(amount, self.capacity)
+            while True:
+                self._refill()
+                if self._level >= need:
+                    self._level -= amount
+                    return waited
+                delay = (need - self._level) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+
+class AIMDLimiter:
+    """Concurrency cap that grows by ~1 per window of successes and halves on overload.
+
+    Waiters are served first in, first out: a new caller only takes a free
+    slot directly when nobody is queued. `release` never awaits, so a call
+    cancelled while finishing (e.g. a hedge loser) still gives its slot back.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, decrease_factor: float = 0.5) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        # Queue behind earlier callers; `_wake` hands the slot over already counted.
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.in_flight -= 1  # give back the slot we were handed
+                self._wake()
+            else:
+                self._waiters.remove(fut)
+            raise
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self.in_flight += 1
+                fut.set_result(None)
+
+    def release(self, overloaded: Optional[bool]) -> None:
+        """`overloaded` True shrinks the cap, False grows it, None (other errors) leaves it."""
+        self.in_flight -= 1
+        if overloaded is False and self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.increases += 1
+        elif overloaded:
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+                self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+                self._last_decrease = now
+                self.decreases += 1
+        self._wake()
+
+
+class ProviderLimiter:
+    """Per-provider admission control shared by chat and embedding calls.
+
+    A call waits, in order, for any Retry-After pause the provider asked for,
+    then the requests/min and tokens/min buckets, then an AIMD concurrency slot.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int, initial_concurrency: int,
+                 max_concurrency: int) -> None:
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.concurrency = AIMDLimiter(initial_concurrency, 1, max_concurrency)
+        self._paused_until = 0.0
+        self._calls = 0
+        self._throttled = 0
+        self._throttle_seconds = 0.0
+        self._overloads = 0
+
+    def pause(self, seconds: float) -> None:
+        """Hold every new call to this provider for `seconds` (from a Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def _admit(self, tokens: int) -> float:
+        waited = 0.0
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            # Spread the herd released at the end of the pause.
+            pause += random.uniform(0.0, min(1.0, pause * 0.25))
+            await asyncio.sleep(pause)
+            waited += pause
+        if self.requests is not None:
+            waited += await self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += await self.tokens.acquire(max(1, tokens))
+        start = time.monotonic()
+        await self.concurrency.acquire()
+        return waited + time.monotonic() - start
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator["_Slot"]:
+        """Admit one provider call; the body reports its outcome on the yielded slot."""
+        waited = await self._admit(tokens)
+        self._calls += 1
+        if waited > 0.001:
+            self._throttled += 1
+            self._throttle_seconds += waited
+        s = _Slot()
+        try:
+            yield s
+        finally:
+            if s.overloaded:
+                self._overloads += 1
+                if s.retry_after is not None:
+                    self.pause(s.retry_after)
+            self.concurrency.release(s.overloaded)
+
+    def stats(self) -> Dict:
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "increases": self.concurrency.increases,
+            "decreases": self.concurrency.decreases,
+            "calls": self._calls,
+            "throttled_calls": self._throttled,
+            "throttle_seconds": round(self._throttle_seconds, 3),
+            "overloads": self._overloads,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "request_bucket": round(self.requests.level, 1) if self.requests else None,
+            "token_bucket": round(self.tokens.level, 1) if self.tokens else None,
+        }
+
+
+class _Slot:
+    def __init__(self) -> None:
+        self.overloaded: Optional[bool] = None
+        self.retry_after: Optional[float] = None
+
+    def record_response(self, response: httpx.Response) -> None:
+        status = response.status_code
+        if status in OVERLOAD_STATUSES:
+            self.overloaded = True
+            self.retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        elif status < 400:
+            self.overloaded = False
+
+    def record_error(self, exc: BaseException) -> None:
+        if isinstance(exc, httpx.TimeoutException):
+            self.overloaded = True
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+
+
+def provider_limiter(provider: str) -> ProviderLimiter:
+    """Process-wide limiter for "openai" or "openrouter", built from settings on first use."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        if provider == "openai":
+            rpm, tpm = settings.OPENAI_RPM, settings.OPENAI_TPM
+        elif provider == "openrouter":
+            rpm, tpm = settings.OPENROUTER_RPM, settings.OPENROUTER_TPM
+        else:
+            raise ValueError(f"Unknown provider '{provider}'")
+        limiter = ProviderLimiter(provider, rpm, tpm, settings.PROVIDER_INITIAL_CONCURRENCY,
+                                  settings.PROVIDER_MAX_CONCURRENCY)
+        _limiters[provider] = limiter
+    return limiter
+
+
+def limiter_stats() -> Dict:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
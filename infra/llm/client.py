@@ -1,11 +1,18 @@
 import asyncio
 import json
-from typing import Dict, List, Type, TypeVar
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Set, Type, TypeVar
 
 import httpx
 from pydantic import BaseModel, Field, ValidationError, validator
 
 from app.settings import settings
+from infra.http.pool import get_http_client
+from infra.http.rate_limit import backoff_delay, is_retriable, provider_limiter
+from infra.metrics.instruments import LLM_HTTP_ATTEMPT_SECONDS, http_status
+from infra.rag.context_packer import estimate_tokens, fit_text
+from infra.llm.provider_router import ProviderRouter
 from infra.llm.prompts import (
     CATALOG_PROMPT,
     CV_EVAL_PROMPT,
@@ -15,6 +22,12 @@ from infra.llm.prompts import (
 
 T = TypeVar("T", bound=BaseModel)
 
+# Completion tokens assumed per chat call when charging the tokens/min bucket.
+COMPLETION_TOKEN_RESERVE = 500
+
+# Models that answered the chat calls made inside `track_llm_models()`; StageGraph tasks share the set.
+_models_used: ContextVar[Optional[Set[str]]] = ContextVar("llm_models_used", default=None)
+
 
 class CVEvaluationPayload(BaseModel):
     cv_match_rate: float = Field(..., ge=0.0, le=1.0)
@@ -52,31 +65,49 @@ async def _post_with_retries(
     headers: Dict[str, str],
     payload: Dict,
     *,
+    provider: str = "openai",
     timeout: int = 15,
     max_attempts: int = 3,
 ) -> Dict:
-    backoff = 1.0
+    limiter = provider_limiter(provider)
+    tokens = _estimate_payload_tokens(payload)
+    host = httpx.URL(url).host
     for attempt in range(1, max_attempts + 1):
+        retry_after = None
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(url, headers=headers, json=payload)
+            async with limiter.slot(tokens) as slot:
+                with LLM_HTTP_ATTEMPT_SECONDS.time(host=host, status="error",
+                                                   retry=str(attempt > 1).lower()) as labels:
+                    try:
+                        response = await get_http_client().post(
+                            url, headers=headers, json=payload, timeout=timeout)
+                    except httpx.RequestError as exc:
+                        labels["status"] = http_status(exc)
+                        slot.record_error(exc)
+                        raise
+                    labels["status"] = str(response.status_code)
+                slot.record_response(response)
+                retry_after = slot.retry_after
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as exc:
-            status = exc.response.status_code
-            retriable = status >= 500 or status in {408, 429}
-            if not retriable or attempt == max_attempts:
+            if not is_retriable(exc.response.status_code) or attempt == max_attempts:
                 raise
         except httpx.RequestError:
             if attempt == max_attempts:
                 raise
-        await asyncio.sleep(backoff)
-        backoff *= 2
+        await asyncio.sleep(backoff_delay(attempt, retry_after))
     raise RuntimeError("Unexpected retry exhaustion")
 
 
+def _estimate_payload_tokens(payload: Dict) -> int:
+    """Prompt estimate plus a completion reserve, for the tokens/min budget."""
+    prompt = sum(estimate_tokens(str(m.get("content", ""))) for m in payload.get("messages", []))
+    return prompt + COMPLETION_TOKEN_RESERVE
+
+
 async def _openai_chat(messages, model: str) -> str:
-    url = "https://api.openai.com/v1/chat/completions"
+    url = f"{settings.OPENAI_BASE_URL}/chat/completions"
     headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
     payload = {"model": model, "messages": messages, "temperature": 0.2}
     data = await _post_with_retries(url, headers, payload)
@@ -84,23 +115,59 @@ async def _openai_chat(messages, model: str) -> str:
 
 
 async def _openrouter_chat(messages, model: str) -> str:
-    url = "https://openrouter.ai/api/v1/chat/completions"
+    url = f"{settings.OPENROUTER_BASE_URL}/chat/completions"
     headers = {
         "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
         "HTTP-Referer": "http://localhost",
         "X-Title": settings.APP_NAME,
     }
     payload = {"model": model, "messages": messages, "temperature": 0.2}
-    data = await _post_with_retries(url, headers, payload)
+    data = await _post_with_retries(url, headers, payload, provider="openrouter")
     return data["choices"][0]["message"]["content"]
 
 
-async def _choose_and_call(messages) -> str:
+def active_model_name() -> Optional[str]:
+    """Model of the preferred provider, or None when no provider is configured."""
+    if settings.OPENAI_API_KEY:
+        return settings.OPENAI_MODEL
+    if settings.OPENROUTER_API_KEY:
+        return settings.OPENROUTER_MODEL
+    return None
+
+
+def _provider_model(provider: str) -> str:
+    return settings.OPENAI_MODEL if provider == "openai" else settings.OPENROUTER_MODEL
+
+
+@contextmanager
+def track_llm_models() -> Iterator[Set[str]]:
+    """Collect the models that actually answered chat calls made inside the block."""
+    token = _models_used.set(set())
+    try:
+        yield _models_used.get()
+    finally:
+        _models_used.reset(token)
+
+
+def _configured_senders():
+    senders = []
     if settings.OPENAI_API_KEY:
-        return await _openai_chat(messages, settings.OPENAI_MODEL)
+        senders.append(("openai", lambda messages: _openai_chat(messages, settings.OPENAI_MODEL)))
     if settings.OPENROUTER_API_KEY:
-        return await _openrouter_chat(messages, settings.OPENROUTER_MODEL)
-    raise RuntimeError("No LLM provider configured")
+        senders.append(("openrouter", lambda messages: _openrouter_chat(messages, settings.OPENROUTER_MODEL)))
+    return senders
+
+
+provider_router = ProviderRouter(_configured_senders())
+
+
+async def _choose_and_call(messages, model: Type[T]) -> T:
+    """Validated response from the healthiest provider (hedged/failed over when both are configured)."""
+    provider, parsed = await provider_router.call(messages, lambda raw: _validate_llm_response(raw, model))
+    used = _models_used.get()
+    if used is not None:
+        used.add(_provider_model(provider))
+    return parsed
 
 
 def _validate_llm_response(raw_text: str, model: Type[T]) -> T:
@@ -113,36 +180,34 @@ def _validate_llm_response(raw_text: str, model: Type[T]) -> T:
 
 
 async def evaluate_cv_llm(cv_text: str, refs: List[str]) -> Dict:
-    content = f"{CV_EVAL_PROMPT}\n\nCV:\n{cv_text[:5000]}\n\nReferences:\n" + "\n---\n".join(
-        refs[:5]
+    content = f"{CV_EVAL_PROMPT}\n\nCV:\n{fit_text(cv_text, settings.LLM_DOC_TOKEN_BUDGET)}\n\nReferences:\n" + "\n---\n".join(
+        refs
     )
     messages = [
         {"role": "system", "content": "You are a strict evaluator returning only valid JSON."},
         {"role": "user", "content": content},
     ]
     try:
-        resp = await _choose_and_call(messages)
+        parsed = await _choose_and_call(messages, CVEvaluationPayload)
     except RuntimeError:
         return CVEvaluationPayload(cv_match_rate=0.5, cv_feedback=["Stub feedback."]).dict()
-    parsed = _validate_llm_response(resp, CVEvaluationPayload)
     return parsed.dict()
 
 
 async def evaluate_project_llm(report_text: str, refs: List[str]) -> Dict:
-    content = f"{PROJECT_EVAL_PROMPT}\n\nReport:\n{report_text[:5000]}\n\nReferences:\n" + "\n---\n".join(
-        refs[:5]
+    content = f"{PROJECT_EVAL_PROMPT}\n\nReport:\n{fit_text(report_text, settings.LLM_DOC_TOKEN_BUDGET)}\n\nReferences:\n" + "\n---\n".join(
+        refs
     )
     messages = [
         {"role": "system", "content": "You are a strict evaluator returning only valid JSON."},
         {"role": "user", "content": content},
     ]
     try:
-        resp = await _choose_and_call(messages)
+        parsed = await _choose_and_call(messages, ProjectEvaluationPayload)
     except RuntimeError:
         return ProjectEvaluationPayload(
             project_score=2.5, project_feedback=["Stub feedback."]
         ).dict()
-    parsed = _validate_llm_response(resp, ProjectEvaluationPayload)
     return parsed.dict()
 
 
@@ -155,10 +220,9 @@ async def summarize_overall_llm(cv_eval: Dict, project_eval: Dict) -> Dict:
         {"role": "user", "content": content},
     ]
     try:
-        resp = await _choose_and_call(messages)
+        parsed = await _choose_and_call(messages, SummaryPayload)
     except RuntimeError:
         return SummaryPayload(overall_summary="Stub overall summary.").dict()
-    parsed = _validate_llm_response(resp, SummaryPayload)
     return parsed.dict()
 
 
@@ -174,7 +238,7 @@ async def generate_job_catalog_metadata(raw_text: str, timeout=30) -> dict:
     }
     headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
     data = await _post_with_retries(
-        "https://api.openai.com/v1/chat/completions",
+        f"{settings.OPENAI_BASE_URL}/chat/completions",
         headers,
         payload,
         timeout=timeout,
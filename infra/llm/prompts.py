@@ -1,3 +1,5 @@
+import hashlib
+
 CV_EVAL_PROMPT = """
 You are an impartial evaluator assessing how well a candidate's CV aligns with the provided References.
 
@@ -84,3 +86,8 @@ Guidelines:
 - The JSON must be valid and self-contained.
 - Output ONLY JSON. No prose.
 """
+
+# Changes whenever any evaluation prompt changes; part of the result-cache key.
+PROMPT_VERSION = hashlib.sha256(
+    (CV_EVAL_PROMPT + PROJECT_EVAL_PROMPT + FINAL_SUMMARY_PROMPT).encode("utf-8")
+).hexdigest()[:12]
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Sender = Callable[[List[Dict]], Awaitable[str]]
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class ProviderHealth:
+    """Rolling latency/outcome window and circuit breaker for one provider.
+
+    The breaker opens when at least `LLM_BREAKER_MIN_CALLS` of the recent calls
+    are recorded and their error rate reaches `LLM_BREAKER_ERROR_RATE`. After
+    `LLM_BREAKER_COOLDOWN_SECONDS` a single probe is let through: success
+    closes it, failure re-opens it. The probe slot is claimed by the caller
+    that is let through, and held until that call records an outcome or
+    gives the slot back.
+    """
+
+    def __init__(self, name: str, window: int) -> None:
+        self.name = name
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probe_owner: Optional[object] = None
+        self._probe_done: Optional[asyncio.Event] = None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+    def error_rate(self) -> float:
+        return (1.0 - sum(self.outcomes) / len(self.outcomes)) if self.outcomes else 0.0
+
+    @property
+    def probing(self) -> bool:
+        return self._probe_owner is not None
+
+    def claim(self, owner: object) -> bool:
+        """Whether `owner` may call this provider now; in half-open state it takes the one probe slot."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= settings.LLM_BREAKER_COOLDOWN_SECONDS:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self.probing:
+            self._probe_owner = owner
+            self._probe_done = asyncio.Event()
+            return True
+        return False
+
+    async def wait_for_probe(self) -> None:
+        if self.probing and self._probe_done is not None:
+            await self._probe_done.wait()
+
+    def _end_probe(self) -> None:
+        self._probe_owner = None
+        if self._probe_done is not None:
+            self._probe_done.set()
+            self._probe_done = None
+
+    def record_success(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+        self.outcomes.append(True)
+        if self.state != CLOSED:
+            logger.info("LLM provider %s recovered; closing circuit", self.name)
+            self.state = CLOSED
+            self.outcomes.clear()
+        self._end_probe()
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED
+            and len(self.outcomes) >= settings.LLM_BREAKER_MIN_CALLS
+            and self.error_rate() >= settings.LLM_BREAKER_ERROR_RATE
+        ):
+            if self.state == CLOSED:
+                self.trips += 1
+                logger.warning("LLM provider %s error rate %.0f%%; opening circuit for %ss",
+                               self.name, self.error_rate() * 100, settings.LLM_BREAKER_COOLDOWN_SECONDS)
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+        self._end_probe()
+
+    def release_probe(self, owner: object) -> None:
+        """Give back `owner`'s probe slot if its call was cancelled or never made."""
+        if self._probe_owner is owner:
+            self._end_probe()
+
+    def stats(self) -> Dict:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "state": self.state,
+            "samples": len(self.outcomes),
+            "error_rate": round(self.error_rate(), 4),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "trips": self.trips,
+        }
+
+
+class ProviderRouter:
+    """Sends chat calls to the preferred healthy provider, hedging slow calls to the next one.
+
+    If the primary has not answered within its recent `LLM_HEDGE_PERCENTILE`
+    latency, the same request is sent to the alternate provider. The first
+    response that `parse` accepts wins and the other call is cancelled. A primary
+    that fails outright is retried on the alternate. `call` returns the winning
+    provider's name with the parsed response.
+    """
+
+    def __init__(self, senders: List[Tuple[str, Sender]]) -> None:
+        self._senders = dict(senders)
+        self._preference = [name for name, _ in senders]
+        self.health = {name: ProviderHealth(name, settings.LLM_HEALTH_WINDOW) for name in self._preference}
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._failovers = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._preference)
+
+    def _claim(self, owner: object) -> List[str]:
+        return [name for name in self._preference if self.health[name].claim(owner)]
+
+    async def _order(self, owner: object) -> List[str]:
+        """Providers to use, best first; half-open ones are claimed as `owner`'s probe in the same step."""
+        order = self._claim(owner)
+        preferred = self.health[self._preference[0]]
+        if not order and preferred.probing:
+            # Another call is probing the preferred provider: follow its outcome instead of piling on.
+            await preferred.wait_for_probe()
+            order = self._claim(owner)
+        # With every circuit open, keep trying the preferred provider rather than failing outright.
+        return order or self._preference[:1]
+
+    def hedge_delay(self, provider: str) -> float:
+        health = self.health[provider]
+        observed = health.percentile(settings.LLM_HEDGE_PERCENTILE)
+        if observed is None or len(health.latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+            delay_ms = settings.LLM_HEDGE_INITIAL_DELAY_MS
+        else:
+            delay_ms = observed * 1000
+        return max(settings.LLM_HEDGE_MIN_DELAY_MS, delay_ms) / 1000.0
+
+    async def _attempt(self, provider: str, messages: List[Dict], parse: Callable[[str], T]) -> Tuple[str, T]:
+        health = self.health[provider]
+        start = time.monotonic()
+        try:
+            out = parse(await self._senders[provider](messages))
+        except Exception:
+            health.record_failure()
+            raise
+        health.record_success(time.monotonic() - start)
+        return provider, out
+
+    async def call(self, messages: List[Dict], parse: Callable[[str], T]) -> Tuple[str, T]:
+        if not self.configured:
+            raise RuntimeError("No LLM provider configured")
+        self._calls += 1
+        owner = object()
+        order = await self._order(owner)
+        primary = order[0]
+        alternate = order[1] if len(order) > 1 else None
+        tasks: List[asyncio.Task] = []
+        try:
+            first = asyncio.create_task(self._attempt(primary, messages, parse))
+            tasks.append(first)
+            hedge_after = self.hedge_delay(primary) if alternate and settings.LLM_HEDGE_ENABLED else None
+            done, _ = await asyncio.wait({first}, timeout=hedge_after)
+            if done:
+                if first.exception() is None or alternate is None:
+                    return first.result()
+                self._failovers += 1
+                logger.warning("LLM provider %s failed (%s); failing over to %s",
+                               primary, first.exception(), alternate)
+                return await self._attempt(alternate, messages, parse)
+
+            self._hedges += 1
+            second = asyncio.create_task(self._attempt(alternate, messages, parse))
+            tasks.append(second)
+            pending = {first, second}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            losers = [t for t in tasks if not t.done()]
+            for t in losers:
+                t.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+            # Probes that were cancelled, never started or never needed (an unused alternate).
+            for name in order:
+                self.health[name].release_probe(owner)
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self._calls,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+            "failovers": self._failovers,
+            "providers": {name: h.stats() for name, h in self.health.items()},
+        }
@@ -0,0 +1,83 @@
+import functools
+import inspect
+import time
+from typing import Callable, TypeVar
+
+from infra.metrics.registry import registry
+
+F = TypeVar("F", bound=Callable)
+
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "cv_eval_pipeline_stage_seconds",
+    "Wall time of one evaluation pipeline stage, after its lane slot was acquired.",
+    ["stage", "outcome"],
+)
+EVALUATION_SECONDS = registry.histogram(
+    "cv_eval_evaluation_seconds",
+    "End-to-end run_evaluation wall time.",
+    ["outcome"],
+)
+LLM_HTTP_ATTEMPT_SECONDS = registry.histogram(
+    "cv_eval_llm_http_attempt_seconds",
+    "One chat-completion HTTP attempt; retry is 'true' for every attempt after the first.",
+    ["host", "status", "retry"],
+)
+EMBED_HTTP_SECONDS = registry.histogram(
+    "cv_eval_embedding_http_seconds",
+    "One embeddings HTTP request.",
+    ["status"],
+)
+VECTOR_STORE_SECONDS = registry.histogram(
+    "cv_eval_vector_store_seconds",
+    "One vector store call.",
+    ["backend", "op", "collection", "outcome"],
+)
+REPOSITORY_WRITE_SECONDS = registry.histogram(
+    "cv_eval_repository_write_seconds",
+    "One repository write (insert, update or upsert).",
+    ["repository", "op", "outcome"],
+)
+JOBS_QUEUED = registry.gauge("cv_eval_jobs_queued", "Jobs waiting in the scheduler queue.")
+JOBS_IN_FLIGHT = registry.gauge("cv_eval_jobs_in_flight", "Jobs currently being evaluated.")
+
+
+def http_status(exc: BaseException) -> str:
+    """Status label for a failed HTTP call: the response code, else the transport error type."""
+    response = getattr(exc, "response", None)
+    if response is not None:
+        return str(response.status_code)
+    return type(exc).__name__
+
+
+def observe_write(repository: str, op: str) -> Callable[[F], F]:
+    """Decorate a sync or async repository method to record its latency."""
+
+    def decorate(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await fn(*args, **kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    REPOSITORY_WRITE_SECONDS.observe(time.perf_counter() - start,
+                                                     repository=repository, op=op, outcome=outcome)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                REPOSITORY_WRITE_SECONDS.observe(time.perf_counter() - start,
+                                                 repository=repository, op=op, outcome=outcome)
+        return wrapper
+
+    return decorate
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from app.settings import settings
+from infra.pdf.parser import extract_head, extract_page_range, extract_rubric_markdown
+
+logger = logging.getLogger(__name__)
+
+
+class PdfExtractionError(RuntimeError):
+    pass
+
+
+class PdfExtractionService:
+    """Runs pdfplumber in worker processes so PDF work never blocks the event loop.
+
+    The first task returns the page count together with the first page batch;
+    larger documents fan the remaining pages out across workers. Each worker is
+    its own single-process executor: the timeout starts once a worker picks the
+    task up, and a hung or crashed worker is replaced on its own, so one
+    malformed PDF never fails extractions running on the other workers.
+    """
+
+    def __init__(self, workers: int, timeout: float, pages_per_task: int) -> None:
+        self._workers = max(1, workers)
+        self._timeout = timeout
+        self._pages_per_task = max(1, pages_per_task)
+        self._executors: List[ProcessPoolExecutor] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    def start(self) -> None:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self._workers):
+                self._idle.put_nowait(self._spawn())
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors = []
+        self._idle = None
+
+    def _spawn(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self._executors.append(executor)
+        return executor
+
+    def _replace(self, executor: ProcessPoolExecutor) -> None:
+        """Kill `executor`'s worker and hand a fresh one to the idle queue, unless the pool was closed."""
+        for proc in list((getattr(executor, "_processes", None) or {}).values()):
+            proc.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+        owned = executor in self._executors
+        if owned:
+            self._executors.remove(executor)
+        if self._idle is None or not owned:
+            return  # the pool was closed (and maybe restarted) while this worker was out
+        self._idle.put_nowait(self._spawn())
+
+    def _release_when_done(self, executor: ProcessPoolExecutor, fut: asyncio.Future) -> None:
+        """Return `executor` to the idle queue once its task finishes, unless it was replaced."""
+        def release(f: asyncio.Future) -> None:
+            if not f.cancelled():
+                f.exception()  # retrieved here so an abandoned result is not reported as unhandled
+            if executor in self._executors:
+                self._idle.put_nowait(executor)
+
+        fut.add_done_callback(release)
+
+    async def _run(self, fn, *args):
+        """Run `fn(*args)` on the next idle worker; the timeout covers only the run itself."""
+        self.start()
+        executor = await self._idle.get()
+        fut = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        try:
+            # Shielded so a cancelled caller leaves the worker to finish before it is reused.
+            return await asyncio.wait_for(asyncio.shield(fut), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._replace(executor)
+            raise
+        except BrokenProcessPool:
+            self._replace(executor)
+            raise
+        finally:
+            self._release_when_done(executor, fut)
+
+    async def _extract(self, path: str, max_pages: Optional[int]) -> Tuple[str, int]:
+        head_pages = self._pages_per_task if max_pages is None else min(self._pages_per_task, max_pages)
+        total, head = await self._run(extract_head, path, head_pages)
+        last = total if max_pages is None else min(total, max_pages)
+        if last <= head_pages:
+            return head, total
+        ranges = [
+            (start, min(start + self._pages_per_task, last))
+            for start in range(head_pages, last, self._pages_per_task)
+        ]
+        rest: List[str] = await asyncio.gather(*(
+            self._run(extract_page_range, path, s, e) for s, e in ranges
+        ))
+        return "\n".join([head, *rest]), total
+
+    async def extract_text(self, path: str, max_pages: Optional[int] = None) -> str:
+        text, _ = await self.extract_document(path, max_pages=max_pages)
+        return text
+
+    async def extract_document(self, path: str, max_pages: Optional[int] = None) -> Tuple[str, int]:
+        """Extracted text plus the document's total page count."""
+        return await self._guarded(self._extract(path, max_pages), path)
+
+    async def extract_rubric_markdown(self, path: str) -> str:
+        """Rubric tables rendered as markdown (see `parser.extract_rubric_markdown`)."""
+        return await self._guarded(self._run(extract_rubric_markdown, path), path)
+
+    async def _guarded(self, work, path: str):
+        try:
+            return await work
+        except asyncio.TimeoutError as exc:
+            logger.warning("PDF extraction task timed out after %ss; replaced its worker: %s", self._timeout, path)
+            raise PdfExtractionError(f"PDF extraction timed out: {path}") from exc
+        except BrokenProcessPool as exc:
+            logger.warning("PDF worker crashed while extracting %s; replaced it", path)
+            raise PdfExtractionError(f"PDF worker crashed: {path}") from exc
+        except PdfExtractionError:
+            raise
+        except Exception as exc:
+            raise PdfExtractionError(f"Could not extract text from {path}: {exc}") from exc
+
+
+pdf_extractor = PdfExtractionService(
+    workers=settings.PDF_WORKERS,
+    timeout=settings.PDF_TIMEOUT_SECONDS,
+    pages_per_task=settings.PDF_PAGES_PER_TASK,
+)
@@ -1,3 +1,6 @@
+import re
+from typing import List, Tuple
+
 import pdfplumber
 
 def parse_pdf_text(path: str) -> str:
@@ -6,4 +9,94 @@ def parse_pdf_text(path: str) -> str:
         for page in pdf.pages:
             t = page.extract_text() or ""
             text_parts.append(t)
-    return "\n".join(text_parts)
\ No newline at end of file
+    return "\n".join(text_parts)
+
+
+def extract_page_range(path: str, start: int, end: int) -> str:
+    """Text of pages [start, end), joined the same way as `parse_pdf_text`."""
+    with pdfplumber.open(path) as pdf:
+        return "\n".join((page.extract_text() or "") for page in pdf.pages[start:end])
+
+
+def extract_head(path: str, max_pages: int) -> Tuple[int, str]:
+    """Total page count plus the text of the first `max_pages` pages, in one open."""
+    with pdfplumber.open(path) as pdf:
+        total = len(pdf.pages)
+        text = "\n".join((page.extract_text() or "") for page in pdf.pages[:max_pages])
+    return total, text
+
+
+def extract_rubric_markdown(path: str) -> str:
+    """Rubric PDF as markdown: section headers plus one `###` block per table row."""
+    md = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            words = page.extract_words()
+            tables = page.extract_tables() or []
+
+            table_bboxes = []
+            for tbl_obj in page.find_tables():
+                table_bboxes.append(tbl_obj.bbox)
+
+            lines_with_pos = []
+            current_line = []
+            current_y = None
+
+            for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+                if current_y is None or abs(word['top'] - current_y) < 3:
+                    current_line.append(word['text'])
+                    current_y = word['top']
+                else:
+                    if current_line:
+                        line_text = ' '.join(current_line).strip()
+                        if line_text:
+                            lines_with_pos.append((current_y, line_text))
+                    current_line = [word['text']]
+                    current_y = word['top']
+
+            if current_line:
+                line_text = ' '.join(current_line).strip()
+                if line_text:
+                    lines_with_pos.append((current_y, line_text))
+
+            content_items = []
+
+            for y_pos, line in lines_with_pos:
+                if any(kw in line for kw in ['Rubric', 'Evaluation', 'scale per parameter']):
+                    content_items.append(('header', y_pos, line))
+
+            for i, (tbl, bbox) in enumerate(zip(tables, table_bboxes)):
+                content_items.append(('table', bbox[1], tbl))
+
+            content_items.sort(key=lambda x: x[1])
+
+            def is_header(cells: List[str]) -> bool:
+                s = set([c.lower() for c in cells])
+                return {"parameter", "description", "scoring guide"} <= s
+
+            for item_type, y_pos, content in content_items:
+                if item_type == 'header':
+                    md.append(f"## {content}\n")
+
+                elif item_type == 'table':
+                    rows = [[cell.strip() if cell else "" for cell in row]
+                            for row in content if row]
+
+                    for r in rows:
+                        if not any(r) or is_header(r):
+                            continue
+
+                        param = re.sub(r"\(.*?weight.*?\)", "",
+                                       r[0], flags=re.I).strip()
+                        if not param:
+                            continue
+
+                        desc = r[1] if len(r) > 1 else ""
+                        guide = r[2] if len(r) > 2 else ""
+
+                        md += [f"### {param}",
+                               f"**Description:** {desc}" if desc else "",
+                               f"**Guide:** {guide}" if guide else "",
+                               ""]
+
+    return "\n".join([x for x in md if x])
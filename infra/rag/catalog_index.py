@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.settings import settings
+from infra.rag.vector_store import COLLECTION_CATALOG, scroll_points
+from infra.repositories.corpus_repository import AsyncCorpusRepository
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_title(title: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form used for alias lookups."""
+    return " ".join(_NON_WORD.sub(" ", title.lower()).split())
+
+
+class CatalogIndex:
+    """In-memory copy of the `job_catalog` collection for local job title resolution.
+
+    Holds one unit-normalized float32 row per searchable term plus a hash map
+    of normalized titles/aliases, and reloads when the corpus version changes.
+    """
+
+    def __init__(self, version_ttl: float) -> None:
+        self._version_ttl = version_ttl
+        self._corpus = AsyncCorpusRepository()
+        self._lock = asyncio.Lock()
+        self._version: Optional[int] = None
+        self._checked = 0.0
+        self._matrix: Optional[np.ndarray] = None
+        self._payloads: List[Dict] = []
+        self._aliases: Dict[str, int] = {}
+        self.alias_hits = 0
+        self.vector_searches = 0
+        self.reloads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._matrix is not None and len(self._payloads) > 0
+
+    async def load(self) -> None:
+        async with self._lock:
+            await self._load(await self._corpus.get_version())
+
+    async def _load(self, version: int) -> None:
+        self._checked = time.monotonic()
+        try:
+            points = await scroll_points(COLLECTION_CATALOG, doc_types=["job_catalog"], with_vectors=True)
+            points = [p for p in points if p["vector"]]
+            if not points:
+                # Nothing ingested yet: stay unloaded so resolution uses the vector store search.
+                self._matrix, self._payloads, self._aliases = None, [], {}
+                self._version = version
+                logger.info("Job catalog is empty (corpus v%s); resolving via vector store search", version)
+                return
+            payloads = [p["payload"] for p in points]
+            matrix = np.asarray([p["vector"] for p in points], dtype=np.float32).reshape(len(points), -1)
+        except Exception as e:
+            logger.warning("Job catalog load failed; resolving via vector store search: %s", e)
+            return
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+
+        aliases: Dict[str, int] = {}
+        ambiguous = set()
+        for i, p in enumerate(payloads):
+            for term in (p.get("searchable_term"), p.get("title")):
+                if not term:
+                    continue
+                for key in (normalize_title(term), normalize_title(term).replace(" ", "")):
+                    prev = aliases.setdefault(key, i)
+                    if payloads[prev].get("job_key") != p.get("job_key"):
+                        ambiguous.add(key)
+        for key in ambiguous:
+            aliases.pop(key, None)
+
+        self._matrix, self._payloads, self._aliases = matrix, payloads, aliases
+        self._version = version
+        self.reloads += 1
+        logger.info("Loaded job catalog: %d terms, %d aliases (corpus v%s)",
+                    len(payloads), len(aliases), version)
+
+    async def refresh(self) -> bool:
+        """Reload if the corpus version moved (checked at most every `version_ttl` s)."""
+        if time.monotonic() - self._checked >= self._version_ttl:
+            async with self._lock:
+                if time.monotonic() - self._checked >= self._version_ttl:
+                    version = await self._corpus.get_version()
+                    if version != self._version or not self.loaded:
+                        await self._load(version)
+                    else:
+                        self._checked = time.monotonic()
+        return self.loaded
+
+    def match_alias(self, job_title: str) -> Optional[Dict]:
+        """Exact or near-exact (punctuation/spacing) alias hit, as a search hit dict."""
+        norm = normalize_title(job_title)
+        idx = self._aliases.get(norm)
+        if idx is None:
+            idx = self._aliases.get(norm.replace(" ", ""))
+        if idx is None:
+            return None
+        self.alias_hits += 1
+        return {"payload": self._payloads[idx], "score": 1.0}
+
+    def search(self, query_vector: List[float], k: int = 5) -> Optional[List[Dict]]:
+        """Cosine top-k over the catalog, or None when the query does not fit the matrix."""
+        if not self.loaded:
+            return None
+        q = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if q.shape[0] != self._matrix.shape[1] or norm == 0.0:
+            return None
+        self.vector_searches += 1
+        scores = self._matrix @ (q / norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{"payload": self._payloads[i], "score": float(scores[i])} for i in top]
+
+    def stats(self) -> Dict:
+        return {
+            "terms": len(self._payloads),
+            "aliases": len(self._aliases),
+            "corpus_version": self._version,
+            "alias_hits": self.alias_hits,
+            "vector_searches": self.vector_searches,
+            "reloads": self.reloads,
+        }
+
+
+catalog_index = CatalogIndex(version_ttl=settings.CORPUS_VERSION_TTL_SECONDS)
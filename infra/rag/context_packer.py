@@ -0,0 +1,104 @@
+from typing import Dict, List
+
+from app.settings import settings
+
+# Chunks are cut with 150-200 chars of overlap; look a bit further to be safe.
+MAX_CHUNK_OVERLAP = 400
+MIN_CHUNK_OVERLAP = 20
+# A block that no longer fits is still included, truncated, if this much budget is left.
+MIN_PARTIAL_TOKENS = 100
+# Conservative for English (~4 chars/token) so request limits hold for denser text too.
+CHARS_PER_TOKEN = 3
+
+
+def packing_signature() -> str:
+    """Identifies the prompt-context budgets; part of the result-cache key."""
+    return f"pack3:{settings.LLM_DOC_TOKEN_BUDGET}:{settings.CV_REF_TOKEN_BUDGET}:{settings.PROJECT_REF_TOKEN_BUDGET}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Token estimate shared by prompt packing, rate-limit charging and embedding request packing."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def join_overlapping(chunks: List[str]) -> str:
+    """Concatenate consecutive chunks, dropping the text each one repeats from the previous."""
+    out = ""
+    for chunk in chunks:
+        if not out:
+            out = chunk
+            continue
+        overlap = 0
+        for k in range(min(len(out), len(chunk), MAX_CHUNK_OVERLAP), MIN_CHUNK_OVERLAP - 1, -1):
+            if out.endswith(chunk[:k]):
+                overlap = k
+                break
+        out = out + chunk[overlap:] if overlap else f"{out}\n{chunk}"
+    return out
+
+
+def fit_text(text: str, budget_tokens: int) -> str:
+    """`text` cut to roughly `budget_tokens`, at a line or word boundary when one is near."""
+    limit = max(0, budget_tokens * CHARS_PER_TOKEN - 1)
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    for sep in ("\n", " "):
+        pos = cut.rfind(sep)
+        if pos >= limit * 0.8:
+            return cut[:pos]
+    return cut
+
+
+def fair_shares(costs: List[int], budget: int) -> List[int]:
+    """Split `budget` across `costs` max-min fairly: small items get all they need, the rest share what is left."""
+    shares = [0] * len(costs)
+    left = budget
+    order = sorted(range(len(costs)), key=costs.__getitem__)
+    for pos, i in enumerate(order):
+        shares[i] = min(costs[i], left // (len(costs) - pos))
+        left -= shares[i]
+    return shares
+
+
+def pack_references(blocks: List[Dict], budget_tokens: int) -> List[str]:
+    """Select reference texts for one prompt within `budget_tokens`.
+
+    Blocks ({"text", "score", "doc_type", ...}) whose text is already covered
+    by a higher-scoring block are dropped. The best block of each doc_type is
+    taken first so no evidence class is crowded out; only when those together
+    exceed the budget are they cut, to fair shares, so budget a short block
+    does not need goes to the longer ones. The rest fill the budget by score.
+    """
+    ranked = sorted(blocks, key=lambda b: b.get("score", 0.0), reverse=True)
+    unique: List[Dict] = []
+    for b in ranked:
+        text = b["text"].strip()
+        if text and not any(text in u["text"] for u in unique):
+            unique.append({**b, "text": text})
+
+    firsts, seen_types = [], set()
+    for b in unique:
+        if b.get("doc_type") not in seen_types:
+            seen_types.add(b.get("doc_type"))
+            firsts.append(b)
+
+    picked: List[str] = []
+    remaining = budget_tokens
+    shares = fair_shares([estimate_tokens(b["text"]) for b in firsts], budget_tokens)
+    for b, share in zip(firsts, shares):
+        text = fit_text(b["text"], share)
+        picked.append(text)
+        remaining -= estimate_tokens(text)
+
+    for b in (b for b in unique if b not in firsts):
+        if remaining <= 0:
+            break
+        cost = estimate_tokens(b["text"])
+        if cost <= remaining:
+            picked.append(b["text"])
+            remaining -= cost
+        elif remaining >= MIN_PARTIAL_TOKENS:
+            picked.append(fit_text(b["text"], remaining))
+            remaining = 0
+    return picked
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Keys per lookup, well under SQLite's host-parameter limit (999 on older builds).
+_LOOKUP_CHUNK = 500
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(model: str, dimensions: Optional[int], text: str) -> str:
+    raw = f"{model}|{dimensions or ''}|{_normalize(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: bounded in-memory LRU in front of SQLite float32 blobs."""
+
+    def __init__(self, max_items: int, path: Optional[str]) -> None:
+        self._max_items = max_items
+        self._mem: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self._path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+        return self._db
+
+    def _remember(self, key: str, vec: List[float]) -> None:
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self._max_items:
+            self._mem.popitem(last=False)
+
+    def _disk_get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        if not self._path or not keys:
+            return {}
+        rows = []
+        with self._lock:
+            db = self._conn()
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = list(keys[start:start + _LOOKUP_CHUNK])
+                marks = ",".join("?" * len(chunk))
+                rows += db.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", chunk).fetchall()
+        out = {}
+        for key, blob in rows:
+            vec = array("f")
+            vec.frombytes(blob)
+            out[key] = vec.tolist()
+        return out
+
+    def _disk_put_many(self, items: Dict[str, List[float]]) -> None:
+        if not self._path or not items:
+            return
+        with self._lock:
+            db = self._conn()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                [(k, array("f", v).tobytes()) for k, v in items.items()],
+            )
+            db.commit()
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+        pending = []
+        for key in keys:
+            vec = self._mem.get(key)
+            if vec is not None:
+                self._mem.move_to_end(key)
+                found[key] = vec
+            else:
+                pending.append(key)
+        if pending:
+            try:
+                from_disk = await asyncio.to_thread(self._disk_get_many, pending)
+            except sqlite3.Error as exc:
+                logger.warning("Embedding cache read failed: %s", exc)
+                from_disk = {}
+            for key, vec in from_disk.items():
+                self._remember(key, vec)
+            found.update(from_disk)
+            self.disk_hits += len(from_disk)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def put_many(self, items: Dict[str, List[float]]) -> None:
+        for key, vec in items.items():
+            self._remember(key, vec)
+        try:
+            await asyncio.to_thread(self._disk_put_many, items)
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache write failed: %s", exc)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "memory_items": len(self._mem),
+            "max_memory_items": self._max_items,
+            "persistent": bool(self._path),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+embedding_cache = EmbeddingCache(
+    max_items=settings.EMBED_CACHE_MAX_ITEMS,
+    path=settings.EMBED_CACHE_PATH,
+)
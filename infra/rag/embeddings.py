@@ -1,18 +1,198 @@
-from typing import List
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
 import httpx
+
 from app.settings import settings
+from infra.http.pool import get_http_client
+from infra.http.rate_limit import backoff_delay, is_retriable, provider_limiter
+from infra.metrics.instruments import EMBED_HTTP_SECONDS, http_status
+from infra.rag.context_packer import estimate_tokens
+from infra.rag.embedding_cache import cache_key, embedding_cache
+
+# Provider calls made so far; read by ingestion for throughput reporting.
+embedding_usage: Dict[str, int] = {"requests": 0, "inputs": 0, "tokens": 0}
+
+# Native vector sizes; models not listed here are assumed to produce 1536 unless
+# OPENAI_EMBEDDING_DIMENSIONS says otherwise.
+NATIVE_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+_request_slots = asyncio.Semaphore(max(1, settings.EMBED_CONCURRENCY))
+
+
+def embedding_dimensions() -> int:
+    """Vector size produced by the configured embedding model and dimensions."""
+    return settings.OPENAI_EMBEDDING_DIMENSIONS or NATIVE_DIMENSIONS.get(settings.OPENAI_EMBEDDING_MODEL, 1536)
+
+
+def pack_requests(texts: List[str], max_items: int, max_tokens: int) -> List[List[str]]:
+    """Split `texts` into consecutive batches within the per-request input and token limits."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    tokens = 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if current and (len(current) >= max_items or tokens + cost > max_tokens):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(text)
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _embed_request(texts: List[str], max_attempts: int = 3) -> List[List[float]]:
+    url = f"{settings.OPENAI_BASE_URL}/embeddings"
+    headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+    payload = {"model": settings.OPENAI_EMBEDDING_MODEL, "input": texts}
+    if settings.OPENAI_EMBEDDING_DIMENSIONS:
+        payload["dimensions"] = settings.OPENAI_EMBEDDING_DIMENSIONS
+    limiter = provider_limiter("openai")
+    tokens = sum(estimate_tokens(t) for t in texts)
+    for attempt in range(1, max_attempts + 1):
+        retry_after = None
+        try:
+            async with _request_slots, limiter.slot(tokens) as slot:
+                with EMBED_HTTP_SECONDS.time(status="error") as labels:
+                    try:
+                        r = await get_http_client().post(url, headers=headers, json=payload, timeout=60)
+                    except httpx.RequestError as exc:
+                        labels["status"] = http_status(exc)
+                        slot.record_error(exc)
+                        raise
+                    labels["status"] = str(r.status_code)
+                slot.record_response(r)
+                retry_after = slot.retry_after
+            r.raise_for_status()
+            break
+        except httpx.HTTPStatusError as exc:
+            if not is_retriable(exc.response.status_code) or attempt == max_attempts:
+                raise
+        except httpx.RequestError:
+            if attempt == max_attempts:
+                raise
+        await asyncio.sleep(backoff_delay(attempt, retry_after))
+    data = r.json()
+    embedding_usage["requests"] += 1
+    embedding_usage["inputs"] += len(texts)
+    embedding_usage["tokens"] += int((data.get("usage") or {}).get("total_tokens") or tokens)
+    return [item["embedding"] for item in sorted(data["data"], key=lambda d: d.get("index", 0))]
+
+
+async def _embed_remote(texts: List[str]) -> List[List[float]]:
+    batches = pack_requests(texts, settings.EMBED_MAX_BATCH_ITEMS, settings.EMBED_MAX_BATCH_TOKENS)
+    results = await asyncio.gather(*(_embed_request(b) for b in batches))
+    return [vec for batch in results for vec in batch]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding calls into shared provider requests.
+
+    Texts queue up until `max_batch` are pending or `max_wait_ms` has passed
+    since the first one arrived; the batch is then embedded in one call
+    (deduplicated) and each caller gets its own vectors back.
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: float) -> None:
+        self._max_batch = max(1, max_batch)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._sending: Set[asyncio.Task] = set()
+        self.calls = 0
+        self.batches = 0
+        self.inputs = 0
+        self.size_flushes = 0
+        self.timer_flushes = 0
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        self.calls += 1
+        futures = []
+        for text in texts:
+            fut = loop.create_future()
+            self._pending.append((text, fut))
+            futures.append(fut)
+            if len(self._pending) >= self._max_batch:
+                self.size_flushes += 1
+                self._flush()
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._on_timer)
+        return list(await asyncio.gather(*futures))
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if self._pending:
+            self.timer_flushes += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        unique = list(dict.fromkeys(text for text, _ in batch))
+        self.batches += 1
+        self.inputs += len(unique)
+        try:
+            vectors = dict(zip(unique, await _embed_remote(unique)))
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for text, fut in batch:
+            if not fut.done():
+                fut.set_result(vectors[text])
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "batches": self.batches,
+            "inputs": self.inputs,
+            "size_flushes": self.size_flushes,
+            "timer_flushes": self.timer_flushes,
+            "pending": len(self._pending),
+            "avg_batch_size": round(self.inputs / self.batches, 2) if self.batches else 0.0,
+            "fill_ratio": round(self.inputs / (self.batches * self._max_batch), 4) if self.batches else 0.0,
+        }
+
+
+embedding_batcher = EmbeddingBatcher(
+    max_batch=settings.EMBED_MICROBATCH_MAX_ITEMS,
+    max_wait_ms=settings.EMBED_MICROBATCH_WAIT_MS,
+)
 
 
 async def embed_texts_openai(texts: List[str]) -> List[List[float]]:
-    api_key = settings.OPENAI_API_KEY
-    model = settings.OPENAI_EMBEDDING_MODEL
-    if not api_key:
+    if not settings.OPENAI_API_KEY:
         return [[0.0]*8 for _ in texts]
-    url = "https://api.openai.com/v1/embeddings"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    payload = {"model": model, "input": texts}
-    async with httpx.AsyncClient(timeout=60) as client:
-        r = await client.post(url, headers=headers, json=payload)
-        r.raise_for_status()
-        data = r.json()
-    return [item["embedding"] for item in data["data"]]
+    if not texts:
+        return []
+    keys = [
+        cache_key(settings.OPENAI_EMBEDDING_MODEL, settings.OPENAI_EMBEDDING_DIMENSIONS, t)
+        for t in texts
+    ]
+    found = await embedding_cache.get_many(keys)
+
+    # Embed each distinct missing text once, then fan results back out in input order.
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        vectors = await embedding_batcher.embed(list(missing.values()))
+        fresh = dict(zip(missing.keys(), vectors))
+        await embedding_cache.put_many(fresh)
+        found.update(fresh)
+    return [found[k] for k in keys]
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from infra.rag.vector_store import INDEXED_FIELDS, Filters, VectorStore
+
+# Rows scored per matrix product; bounds temporary memory on large collections.
+SEARCH_BLOCK_ROWS = 8192
+# Deleted rows are tombstoned; files are rewritten once this share of rows is dead.
+COMPACT_DEAD_RATIO = 0.25
+
+
+def _write_atomic(path: str, data: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _Collection:
+    """One collection on disk: meta.json, points.jsonl and a float32 row file.
+
+    Vectors are stored unit-normalized, so cosine similarity is a dot product,
+    and are read through a read-only memmap. Payload values of
+    INDEXED_FIELDS are kept in inverted indexes (field -> value -> rows).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.meta_path = os.path.join(path, "meta.json")
+        self.points_path = os.path.join(path, "points.jsonl")
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.mtime_ns = 0
+        self.load()
+
+    def load(self) -> None:
+        with open(self.meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        self.mtime_ns = os.stat(self.meta_path).st_mtime_ns
+        self.dim: int = meta["dim"]
+        count: int = meta["count"]
+        self.ids: List[Optional[str]] = []
+        self.payloads: List[Optional[Dict]] = []
+        if count:
+            with open(self.points_path, encoding="utf-8") as f:
+                for line in f:
+                    if len(self.ids) == count:
+                        break
+                    rec = json.loads(line)
+                    self.ids.append(rec["id"])
+                    self.payloads.append(rec["payload"])
+        self.row_of: Dict[str, int] = {pid: i for i, pid in enumerate(self.ids) if pid is not None}
+        self.index: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        for row in range(count):
+            self._index(row)
+        self._map_vectors()
+
+    def _map_vectors(self) -> None:
+        count = len(self.ids)
+        if count:
+            self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+        else:
+            self.vectors = np.empty((0, self.dim), dtype=np.float32)
+
+    def _index(self, row: int) -> None:
+        payload = self.payloads[row]
+        if payload is None:
+            return
+        for field, values in self.index.items():
+            if field in payload:
+                values.setdefault(payload[field], set()).add(row)
+
+    def _unindex(self, row: int) -> None:
+        payload = self.payloads[row]
+        if payload is None:
+            return
+        for field, values in self.index.items():
+            rows = values.get(payload.get(field))
+            if rows is not None:
+                rows.discard(row)
+
+    def is_stale(self) -> bool:
+        try:
+            return os.stat(self.meta_path).st_mtime_ns != self.mtime_ns
+        except FileNotFoundError:
+            return True
+
+    def rows_matching(self, filters: Optional[Filters]) -> np.ndarray:
+        if not filters:
+            return np.fromiter((i for i, p in enumerate(self.payloads) if p is not None), dtype=np.int64)
+        selected: Optional[Set[int]] = None
+        for field, accepted in filters.items():
+            if field in self.index:
+                rows: Set[int] = set()
+                for v in accepted:
+                    rows |= self.index[field].get(v, set())
+            else:
+                wanted = set(accepted)
+                rows = {i for i, p in enumerate(self.payloads) if p is not None and p.get(field) in wanted}
+            selected = rows if selected is None else selected & rows
+            if not selected:
+                break
+        return np.fromiter(sorted(selected or ()), dtype=np.int64)
+
+    def compact(self) -> None:
+        """Rewrite the collection without tombstoned rows."""
+        alive = [i for i, pid in enumerate(self.ids) if pid is not None]
+        vectors = np.asarray(self.vectors[alive], dtype=np.float32) if alive else np.empty((0, self.dim), np.float32)
+        tmp = f"{self.vectors_path}.tmp"
+        vectors.tofile(tmp)
+        os.replace(tmp, self.vectors_path)
+        self.ids = [self.ids[i] for i in alive]
+        self.payloads = [self.payloads[i] for i in alive]
+        self.row_of = {pid: i for i, pid in enumerate(self.ids)}
+        self.index = {field: {} for field in INDEXED_FIELDS}
+        for row in range(len(self.ids)):
+            self._index(row)
+        self.write([], {}, len(self.ids))
+
+    def write(self, appended: List[np.ndarray], overwrites: Dict[int, np.ndarray], old_count: int) -> None:
+        if overwrites:
+            mm = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(old_count, self.dim))
+            rows = sorted(overwrites)
+            mm[rows] = np.stack([overwrites[r] for r in rows])
+            mm.flush()
+            del mm
+        if appended:
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.stack(appended).astype(np.float32).tobytes())
+        _write_atomic(self.points_path, "".join(
+            json.dumps({"id": pid, "payload": p}, ensure_ascii=False) + "\n"
+            for pid, p in zip(self.ids, self.payloads)))
+        _write_atomic(self.meta_path, json.dumps({"dim": self.dim, "count": len(self.ids)}))
+        self.mtime_ns = os.stat(self.meta_path).st_mtime_ns
+        self._map_vectors()
+
+
+class LocalVectorStore(VectorStore):
+    """Embedded vector store: memory-mapped float32 files and brute-force NumPy cosine search.
+
+    Each collection is a directory under `root`. Writers (e.g. `ingest_all.py`
+    in another process) update meta.json last; readers reload a collection
+    when its mtime changes.
+    """
+
+    def __init__(self, root: str) -> None:
+        self._root = root
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+
+    def _open(self, name: str) -> _Collection:
+        c = self._collections.get(name)
+        if c is None or c.is_stale():
+            path = os.path.join(self._root, name)
+            if not os.path.exists(os.path.join(path, "meta.json")):
+                raise ValueError(f"Collection '{name}' not found in {self._root}")
+            c = self._collections[name] = _Collection(path)
+        return c
+
+    def _ensure_collection(self, name: str, vector_size: int) -> None:
+        with self._lock:
+            path = os.path.join(self._root, name)
+            if os.path.exists(os.path.join(path, "meta.json")):
+                return
+            os.makedirs(path, exist_ok=True)
+            open(os.path.join(path, "vectors.f32"), "wb").close()
+            open(os.path.join(path, "points.jsonl"), "w").close()
+            _write_atomic(os.path.join(path, "meta.json"), json.dumps({"dim": vector_size, "count": 0}))
+
+    async def ensure_collection(self, name: str, vector_size: int = 1536) -> None:
+        await asyncio.to_thread(self._ensure_collection, name, vector_size)
+
+    async def list_collections(self) -> List[str]:
+        if not os.path.isdir(self._root):
+            return []
+        return sorted(n for n in os.listdir(self._root)
+                      if os.path.exists(os.path.join(self._root, n, "meta.json")))
+
+    def _upsert(self, collection: str, points: List[Dict]) -> None:
+        with self._lock:
+            c = self._open(collection)
+            vecs = np.asarray([p["vector"] for p in points], dtype=np.float32).reshape(len(points), -1)
+            if vecs.shape[1] != c.dim:
+                raise ValueError(f"Vector size {vecs.shape[1]} does not match collection '{collection}' ({c.dim})")
+            norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+            vecs /= np.where(norms == 0, 1.0, norms)
+
+            old_count = len(c.ids)
+            appended: List[np.ndarray] = []
+            overwrites: Dict[int, np.ndarray] = {}
+            for pt, vec in zip(points, vecs):
+                pid = str(pt["id"])
+                row = c.row_of.get(pid)
+                if row is None:
+                    row = len(c.ids)
+                    c.ids.append(pid)
+                    c.payloads.append(pt["payload"])
+                    c.row_of[pid] = row
+                    appended.append(vec)
+                else:
+                    c._unindex(row)
+                    c.payloads[row] = pt["payload"]
+                    if row >= old_count:
+                        appended[row - old_count] = vec
+                    else:
+                        overwrites[row] = vec
+                c._index(row)
+            c.write(appended, overwrites, old_count)
+
+    async def upsert(self, collection: str, points: List[Dict]) -> None:
+        if points:
+            await asyncio.to_thread(self._upsert, collection, points)
+
+    def _delete(self, collection: str, ids: List[str]) -> None:
+        with self._lock:
+            c = self._open(collection)
+            removed = 0
+            for pid in ids:
+                row = c.row_of.pop(str(pid), None)
+                if row is None:
+                    continue
+                c._unindex(row)
+                c.ids[row] = None
+                c.payloads[row] = None
+                removed += 1
+            if not removed:
+                return
+            dead = sum(1 for pid in c.ids if pid is None)
+            if dead >= COMPACT_DEAD_RATIO * len(c.ids):
+                c.compact()
+            else:
+                c.write([], {}, len(c.ids))
+
+    async def delete(self, collection: str, ids: List[str]) -> None:
+        if ids:
+            await asyncio.to_thread(self._delete, collection, ids)
+
+    def _search(self, collection: str, query_vector: List[float], k: int,
+                filters: Optional[Filters]) -> List[Dict]:
+        with self._lock:
+            c = self._open(collection)
+            rows = c.rows_matching(filters)
+            vectors, payloads = c.vectors, c.payloads
+        q = np.asarray(query_vector, dtype=np.float32)
+        if q.shape[0] != c.dim:
+            raise ValueError(f"Query vector size {q.shape[0]} does not match collection '{collection}' ({c.dim})")
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0 or rows.size == 0 or k <= 0:
+            return []
+        q /= norm
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, rows.size, SEARCH_BLOCK_ROWS):
+            block = rows[start:start + SEARCH_BLOCK_ROWS]
+            scores = vectors[block] @ q
+            best_rows = np.concatenate([best_rows, block])
+            best_scores = np.concatenate([best_scores, scores])
+            if best_scores.size > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        order = np.argsort(-best_scores, kind="stable")
+        return [{"payload": payloads[int(best_rows[i])], "score": float(best_scores[i])} for i in order]
+
+    async def search(self, collection: str, query_vector: List[float], k: int,
+                     filters: Optional[Filters] = None) -> List[Dict]:
+        return await asyncio.to_thread(self._search, collection, query_vector, k, filters)
+
+    def _scroll(self, collection: str, filters: Optional[Filters], with_vectors: bool) -> List[Dict]:
+        with self._lock:
+            c = self._open(collection)
+            rows = c.rows_matching(filters)
+            return [
+                {"payload": c.payloads[r], "vector": c.vectors[r].tolist() if with_vectors else None}
+                for r in rows.tolist()
+            ]
+
+    async def scroll(self, collection: str, filters: Optional[Filters] = None,
+                     with_vectors: bool = False) -> List[Dict]:
+        return await asyncio.to_thread(self._scroll, collection, filters, with_vectors)
@@ -1,168 +1,122 @@
-from ast import Dict
-from typing import Iterable, List, Optional
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, MatchAny, Range
+import asyncio
+from typing import Dict, List, Optional
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, PointIdsList, Filter, FieldCondition, MatchValue, MatchAny,
+)
 from app.settings import settings
-import hashlib
+from infra.rag.vector_store import Filters, VectorStore
 
-COLLECTION_CV = "job_descriptions"
-COLLECTION_PROJECT = "case_and_rubrics"
-COLLECTION_CATALOG = "job_catalog"
 
-
-def get_client():
-    return QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY or None)
-
-
-def _ensure_payload_indexes(collection: str):
-    c = get_client()
-    for field, schema in [
-        ("job_key", "keyword"),
-        ("doc_type", "keyword"),
-        ("source", "keyword"),
-        ("chunk_index", "integer"),
-        #  catalog-specific
-        ("variant", "keyword"),
-        ("alias_index", "integer"),
-        ("title", "keyword"),
-        ("searchable_term", "keyword"),
-    ]:
-        try:
-            c.create_payload_index(
-                collection_name=collection,
-                field_name=field,
-                field_schema=schema
-            )
-        except Exception:
-            pass
-
-
-def ensure_collection(name: str, vector_size: int = 1536):
-    c = get_client()
-    names = {x.name for x in c.get_collections().collections}
-    if name not in names:
-        c.create_collection(collection_name=name, vectors_config=VectorParams(
-            size=vector_size, distance=Distance.COSINE))
-    _ensure_payload_indexes(name)
-
-
-def _stable_id(job_key: str, doc_type: str, text: str, source: str = "", chunk_index: int = -1) -> str:
-    raw = f"{job_key}|{doc_type}|{source}|{chunk_index}|{text}"
-    return hashlib.md5(raw.encode("utf-8")).hexdigest()
-
-
-def upsert_texts_with_ids(collection: str, vectors: list[list[float]], payloads: list[dict]):
-    points = [
-        PointStruct(
-            id=_stable_id(
-                p["job_key"], p["doc_type"], p["text"], p.get(
-                    "source", ""), p.get("chunk_index", -1)
-            ),
-            vector=v,
-            payload=p
-        )
-        for v, p in zip(vectors, payloads)
-    ]
-    get_client().upsert(collection_name=collection, points=points)
-
-
-def search_top_k_filtered(
-    collection: str,
-    query_vector: list[float],
-    k: int,
-    job_key: Optional[str] = None,
-    doc_types: Optional[Iterable[str]] = None,
-):
-    must: list[FieldCondition] = []
-    if job_key:
-        must.append(FieldCondition(key="job_key",
-                    match=MatchValue(value=job_key)))
-    if doc_types:
-        must.append(FieldCondition(key="doc_type",
-                    match=MatchAny(any=list(doc_types))))
-
-    q_filter = Filter(must=must) if must else None
-
-    hits = get_client().search(
-        collection_name=collection,
-        query_vector=query_vector,
-        limit=k,
-        query_filter=q_filter,
-    )
-    return [{"payload": h.payload, "score": float(h.score)} for h in hits]
-
-
-def fetch_neighbors_by_index(
-    collection: str,
-    job_key: str,
-    doc_type: str,
-    source: str,
-    center_index: int,
-    radius: int = 1,
-):
-    """Return chunks with chunk_index in [center_index - radius, center_index + radius] from same doc."""
+def _to_filter(filters: Optional[Filters]) -> Optional[Filter]:
+    if not filters:
+        return None
     must = [
-        FieldCondition(key="job_key", match=MatchValue(value=job_key)),
-        FieldCondition(key="doc_type", match=MatchValue(value=doc_type)),
-        FieldCondition(key="source", match=MatchValue(value=source)),
-        FieldCondition(key="chunk_index", range=Range(
-            gte=max(0, center_index - radius),
-            lte=center_index + radius
-        ))
-    ]
-    flt = Filter(must=must)
-    out = []
-    next_page = None
-    while True:
-        res = get_client().scroll(collection_name=collection,
-                                  scroll_filter=flt, limit=256, offset=next_page)
-        out.extend([p.payload for p in res[0]])
-        next_page = res[1]
-        if next_page is None:
-            break
-    out.sort(key=lambda x: x.get("chunk_index", 0))
-    return out
-
-
-# def debug_list_collections():
-#     c = get_client()
-#     cols = c.get_collections().collections
-#     return [col.name for col in cols]
-
-
-# def debug_count(collection: str, doc_type: Optional[str] = None):
-#     c = get_client()
-#     q_filter = None
-#     if doc_type:
-#         q_filter = Filter(
-#             must=[FieldCondition(
-#                 key="doc_type", match=MatchValue(value=doc_type))]
-#         )
-#     res = c.count(collection_name=collection,
-#                   count_filter=q_filter, exact=True)
-#     return res.count
-
-
-# def debug_scroll_one(collection: str, doc_type: Optional[str] = None):
-#     c = get_client()
-#     q_filter = None
-#     if doc_type:
-#         q_filter = Filter(
-#             must=[FieldCondition(
-#                 key="doc_type", match=MatchValue(value=doc_type))]
-#         )
-#     points, _ = c.scroll(collection_name=collection,
-#                          scroll_filter=q_filter, limit=3, with_payload=True)
-#     return [p.payload for p in points]
-
-
-def upsert_points_batch(collection: str, points: List[Dict]):
-    from qdrant_client.models import PointStruct
-    if not points:
-        return
-    c = get_client()
-    qdrant_points = [
-        PointStruct(id=pt["id"], vector=pt["vector"], payload=pt["payload"])
-        for pt in points
+        FieldCondition(key=field, match=MatchValue(value=values[0]) if len(values) == 1
+                       else MatchAny(any=list(values)))
+        for field, values in filters.items()
     ]
-    c.upsert(collection_name=collection, points=qdrant_points)
+    return Filter(must=must)
+
+
+class QdrantVectorStore(VectorStore):
+    """Vector store backed by a Qdrant server."""
+
+    def __init__(self) -> None:
+        self._client: Optional[AsyncQdrantClient] = None
+        self._ready_collections: set[str] = set()
+        self._indexed_collections: set[str] = set()
+        self._bootstrap_lock = asyncio.Lock()
+
+    @property
+    def client(self) -> AsyncQdrantClient:
+        """Process-wide async client; created on first use and reused by every call."""
+        if self._client is None:
+            self._client = AsyncQdrantClient(
+                url=settings.QDRANT_URL,
+                api_key=settings.QDRANT_API_KEY or None,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _ensure_payload_indexes(self, collection: str):
+        if collection in self._indexed_collections:
+            return
+        for field, schema in [
+            ("job_key", "keyword"),
+            ("doc_type", "keyword"),
+            ("source", "keyword"),
+            ("chunk_index", "integer"),
+            #  catalog-specific
+            ("variant", "keyword"),
+            ("alias_index", "integer"),
+            ("title", "keyword"),
+            ("searchable_term", "keyword"),
+        ]:
+            try:
+                await self.client.create_payload_index(
+                    collection_name=collection,
+                    field_name=field,
+                    field_schema=schema
+                )
+            except Exception:
+                pass
+        self._indexed_collections.add(collection)
+
+    async def ensure_collection(self, name: str, vector_size: int = 1536):
+        """Create the collection and its payload indexes once per process."""
+        if name in self._ready_collections:
+            return
+        async with self._bootstrap_lock:
+            if name in self._ready_collections:
+                return
+            names = {x.name for x in (await self.client.get_collections()).collections}
+            if name not in names:
+                await self.client.create_collection(collection_name=name, vectors_config=VectorParams(
+                    size=vector_size, distance=Distance.COSINE))
+            await self._ensure_payload_indexes(name)
+            self._ready_collections.add(name)
+
+    async def list_collections(self) -> List[str]:
+        return [col.name for col in (await self.client.get_collections()).collections]
+
+    async def upsert(self, collection: str, points: List[Dict]):
+        qdrant_points = [
+            PointStruct(id=pt["id"], vector=pt["vector"], payload=pt["payload"])
+            for pt in points
+        ]
+        await self.client.upsert(collection_name=collection, points=qdrant_points)
+
+    async def delete(self, collection: str, ids: List[str]):
+        await self.client.delete(collection_name=collection, points_selector=PointIdsList(points=list(ids)))
+
+    async def search(self, collection: str, query_vector: List[float], k: int,
+                     filters: Optional[Filters] = None) -> List[Dict]:
+        hits = await self.client.search(
+            collection_name=collection,
+            query_vector=query_vector,
+            limit=k,
+            query_filter=_to_filter(filters),
+        )
+        return [{"payload": h.payload, "score": float(h.score)} for h in hits]
+
+    async def scroll(self, collection: str, filters: Optional[Filters] = None,
+                     with_vectors: bool = False) -> List[Dict]:
+        flt = _to_filter(filters)
+        limit = max(256, len((filters or {}).get("chunk_index", ())))
+        out: List[Dict] = []
+        next_page = None
+        while True:
+            points, next_page = await self.client.scroll(
+                collection_name=collection, scroll_filter=flt, limit=limit,
+                offset=next_page, with_payload=True, with_vectors=with_vectors)
+            out.extend({"payload": p.payload, "vector": p.vector} for p in points)
+            if next_page is None:
+                break
+        return out
@@ -1,109 +1,164 @@
 import logging
 from typing import Optional, Tuple, List, Dict
 import asyncio
+from infra.rag.catalog_index import catalog_index
+from infra.rag.context_packer import join_overlapping
 from infra.rag.embeddings import embed_texts_openai
-from infra.rag.qdrant_client import COLLECTION_CATALOG, COLLECTION_CV, COLLECTION_PROJECT, search_top_k_filtered, fetch_neighbors_by_index
+from infra.rag.vector_store import COLLECTION_CATALOG, COLLECTION_CV, COLLECTION_PROJECT, search_top_k_filtered, fetch_chunks_by_indices
 
 logger = logging.getLogger("evaluation_pipeline")
-logger.setLevel(logging.INFO)
 
 
-def _stitch(hits: List[Dict], collection: str, job_key: str, radius: int = 1) -> List[Dict]:
-    # For each hit, pull neighbor chunks and merge.
-    stitched = []
-    seen_keys = set()
+async def _stitch(hits: List[Dict], collection: str, job_key: str, radius: int = 1) -> List[Dict]:
+    # Hit windows of the same document are merged into contiguous spans, the
+    # chunks for all spans are fetched with one scroll per (source, doc_type),
+    # and each span becomes one block with the chunk overlap removed.
+    windows: Dict[Tuple[str, str], List[Tuple[int, int, float]]] = {}
     for h in hits:
         p = h["payload"]
-        key = (p.get("source"), p.get("doc_type"), p.get("chunk_index"))
-        if key in seen_keys:
-            continue
-        seen_keys.add(key)
-
-        neighbors = fetch_neighbors_by_index(
+        center = p.get("chunk_index", 0)
+        windows.setdefault((p.get("source"), p.get("doc_type")), []).append(
+            (max(0, center - radius), center + radius, float(h.get("score", 0.0))))
+
+    spans: Dict[Tuple[str, str], List[List]] = {}
+    for doc, ws in windows.items():
+        merged: List[List] = []
+        for lo, hi, score in sorted(ws):
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], hi)
+                merged[-1][2] = max(merged[-1][2], score)
+            else:
+                merged.append([lo, hi, score])
+        spans[doc] = merged
+
+    docs = list(spans)
+    fetched = await asyncio.gather(*(
+        fetch_chunks_by_indices(
             collection=collection,
             job_key=job_key,
-            doc_type=p.get("doc_type"),
-            source=p.get("source"),
-            center_index=p.get("chunk_index", 0),
-            radius=radius
+            doc_type=doc_type,
+            source=source,
+            indices={i for lo, hi, _ in spans[(source, doc_type)] for i in range(lo, hi + 1)},
         )
-        # Merge neighbors into one block
-        text_block = "\n".join(n.get("text", "")
-                               for n in neighbors if n.get("text"))
-        stitched.append({
-            "text": text_block,
-            "source": p.get("source"),
-            "doc_type": p.get("doc_type"),
-            "start_chunk_index": min(n.get("chunk_index", 0) for n in neighbors) if neighbors else p.get("chunk_index", 0)
-        })
-    return stitched
+        for source, doc_type in docs
+    ))
+
+    blocks = []
+    for (source, doc_type), payloads in zip(docs, fetched):
+        by_index: Dict[int, str] = {}
+        for n in payloads:
+            if n.get("text"):
+                by_index.setdefault(n.get("chunk_index", 0), n["text"])
+        for lo, hi, score in spans[(source, doc_type)]:
+            present = [i for i in range(lo, hi + 1) if i in by_index]
+            if not present:
+                continue
+            blocks.append({
+                "text": join_overlapping([by_index[i] for i in present]),
+                "source": source,
+                "doc_type": doc_type,
+                "start_chunk_index": present[0],
+                "score": score,
+            })
+    blocks.sort(key=lambda b: b["score"], reverse=True)
+    return blocks
 
 
-async def retrieve_rubrics(
+async def search_rubric_blocks(
     job_key: str,
     k: int = 5,
     radius: int = 1,
     qvec: Optional[List[float]] = None,
-) -> List[str]:
+) -> List[Dict]:
     if qvec is None:
         qvec = (await embed_texts_openai(["scoring rubric for evaluation"]))[0]
-    rb_hits = search_top_k_filtered(
+    rb_hits = await search_top_k_filtered(
         COLLECTION_PROJECT,
         qvec,
         k=k,
         job_key=job_key,
         doc_types=["rubric"],
     )
-    rb_blocks = _stitch(rb_hits, COLLECTION_PROJECT, job_key, radius=radius)
-    return [b["text"] for b in rb_blocks]
+    return await _stitch(rb_hits, COLLECTION_PROJECT, job_key, radius=radius)
 
 
-async def retrieve_for_cv(
+async def search_jd_blocks(
     job_key: str,
     job_title: str,
     job_tags: Optional[List[str]] = None,
     k: int = 5,
     radius: int = 1,
-    rubric_blocks: Optional[List[str]] = None,
     qvec: Optional[List[float]] = None,
-) -> List[str]:
+) -> List[Dict]:
     tag_str = f" relevant tags: {', '.join(job_tags)}" if job_tags else ""
     if qvec is None:
         qvec = (await embed_texts_openai([f"job requirements and evaluation criteria for {job_title}{tag_str}"]))[0]
 
-    jd_hits = search_top_k_filtered(
+    jd_hits = await search_top_k_filtered(
         COLLECTION_CV, qvec, k=k, job_key=job_key, doc_types=["jd_chunk"]
     )
-    jd_blocks = _stitch(jd_hits, COLLECTION_CV, job_key, radius=radius)
-
-    if rubric_blocks is None:
-        rubric_blocks = await retrieve_rubrics(job_key=job_key, k=k, radius=radius)
-
-    blocks = [b["text"] for b in jd_blocks] + rubric_blocks
-    return blocks
+    return await _stitch(jd_hits, COLLECTION_CV, job_key, radius=radius)
 
 
-async def retrieve_for_project(
+async def search_brief_blocks(
     job_key: str,
     job_title: Optional[str] = None,
     job_tags: Optional[List[str]] = None,
     k: int = 5,
     radius: int = 1,
-    rubric_blocks: Optional[List[str]] = None,
     qvec: Optional[List[float]] = None,
-) -> List[str]:
+) -> List[Dict]:
     tag_str = f" relevant tags: {', '.join(job_tags)}" if job_tags else ""
     role_str = f" for {job_title}" if job_title else ""
     if qvec is None:
         qvec = (await embed_texts_openai([f"case study brief and project scoring rubric{role_str}{tag_str}"]))[0]
 
-    brief_hits = search_top_k_filtered(
+    brief_hits = await search_top_k_filtered(
         COLLECTION_PROJECT, qvec, k=k, job_key=job_key, doc_types=[
             "case_brief"]
     )
-    brief_blocks = _stitch(
+    return await _stitch(
         brief_hits, COLLECTION_PROJECT, job_key, radius=radius)
 
+
+async def retrieve_rubrics(
+    job_key: str,
+    k: int = 5,
+    radius: int = 1,
+    qvec: Optional[List[float]] = None,
+) -> List[str]:
+    return [b["text"] for b in await search_rubric_blocks(job_key, k=k, radius=radius, qvec=qvec)]
+
+
+async def retrieve_for_cv(
+    job_key: str,
+    job_title: str,
+    job_tags: Optional[List[str]] = None,
+    k: int = 5,
+    radius: int = 1,
+    rubric_blocks: Optional[List[str]] = None,
+    qvec: Optional[List[float]] = None,
+) -> List[str]:
+    jd_blocks = await search_jd_blocks(job_key, job_title, job_tags, k=k, radius=radius, qvec=qvec)
+
+    if rubric_blocks is None:
+        rubric_blocks = await retrieve_rubrics(job_key=job_key, k=k, radius=radius)
+
+    blocks = [b["text"] for b in jd_blocks] + rubric_blocks
+    return blocks
+
+
+async def retrieve_for_project(
+    job_key: str,
+    job_title: Optional[str] = None,
+    job_tags: Optional[List[str]] = None,
+    k: int = 5,
+    radius: int = 1,
+    rubric_blocks: Optional[List[str]] = None,
+    qvec: Optional[List[float]] = None,
+) -> List[str]:
+    brief_blocks = await search_brief_blocks(job_key, job_title, job_tags, k=k, radius=radius, qvec=qvec)
+
     if rubric_blocks is None:
         rubric_blocks = await retrieve_rubrics(job_key=job_key, k=k, radius=radius)
 
@@ -123,16 +178,29 @@ async def resolve_job_key(
     job_title: str,
     min_similarity: float = 0.80,
 ) -> Tuple[Optional[str], float, List[Dict]]:
-    """Resolve job title to job_key using semantic search on individual terms."""
-    [qvec] = await embed_texts_openai([job_title])
-
-    hits = search_top_k_filtered(
-        collection=COLLECTION_CATALOG,
-        query_vector=qvec,
-        k=5,
-        job_key=None,
-        doc_types=["job_catalog"],
-    )
+    """Resolve job title to job_key using semantic search on individual terms.
+
+    Exact aliases resolve from the in-memory catalog without network calls;
+    other titles are embedded and ranked locally, falling back to a vector
+    store search when the catalog is not loaded.
+    """
+    hits = None
+    if await catalog_index.refresh():
+        alias_hit = catalog_index.match_alias(job_title)
+        if alias_hit is not None:
+            hits = [alias_hit]
+        else:
+            [qvec] = await embed_texts_openai([job_title])
+            hits = catalog_index.search(qvec, k=5)
+    if hits is None:
+        [qvec] = await embed_texts_openai([job_title])
+        hits = await search_top_k_filtered(
+            collection=COLLECTION_CATALOG,
+            query_vector=qvec,
+            k=5,
+            job_key=None,
+            doc_types=["job_catalog"],
+        )
 
     candidates: List[Dict] = []
     seen_job_keys = set()
@@ -163,15 +231,11 @@ async def resolve_job_key(
 
     # Accept if similarity is high (should be 0.90+ for exact alias matches)
     if top["job_key"] and top["similarity"] >= min_similarity:
-        logger.info(
-            f"✓ Matched '{job_title}' → {top['job_key']} "
-            f"(term: '{top['matched_term']}', similarity: {top['similarity']:.3f})"
-        )
+        logger.info("Matched '%s' → %s (term: '%s', similarity: %.3f)",
+                    job_title, top["job_key"], top["matched_term"], top["similarity"])
         return top["job_key"], top["similarity"], candidates
 
     # logger near-miss for debugging
-    logger.warning(
-        f"✗ No confident match for '{job_title}' "
-        f"(best: {top['matched_term']} @ {top['similarity']:.3f})"
-    )
+    logger.warning("No confident match for '%s' (best: %s @ %.3f)",
+                   job_title, top["matched_term"], top["similarity"])
     return None, top["similarity"], candidates
@@ -0,0 +1,188 @@
+import hashlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.settings import settings
+from infra.metrics.instruments import VECTOR_STORE_SECONDS
+
+COLLECTION_CV = "job_descriptions"
+COLLECTION_PROJECT = "case_and_rubrics"
+COLLECTION_CATALOG = "job_catalog"
+
+# Payload fields every backend indexes for filtering.
+INDEXED_FIELDS = ("job_key", "doc_type", "source", "chunk_index")
+
+# field -> accepted values (a point matches if its payload value is any of them)
+Filters = Dict[str, List]
+
+
+class VectorStore(ABC):
+    """Backend-neutral vector collection API used by retrieval and ingestion."""
+
+    @abstractmethod
+    async def ensure_collection(self, name: str, vector_size: int) -> None: ...
+
+    @abstractmethod
+    async def list_collections(self) -> List[str]: ...
+
+    @abstractmethod
+    async def upsert(self, collection: str, points: List[Dict]) -> None:
+        """Insert or replace points given as {"id", "vector", "payload"}."""
+
+    @abstractmethod
+    async def delete(self, collection: str, ids: List[str]) -> None:
+        """Remove points by id; unknown ids are ignored."""
+
+    @abstractmethod
+    async def search(self, collection: str, query_vector: List[float], k: int,
+                     filters: Optional[Filters] = None) -> List[Dict]:
+        """Top-k cosine matches as {"payload", "score"}, best first."""
+
+    @abstractmethod
+    async def scroll(self, collection: str, filters: Optional[Filters] = None,
+                     with_vectors: bool = False) -> List[Dict]:
+        """Every matching point as {"payload", "vector"}."""
+
+    async def close(self) -> None:
+        pass
+
+
+_store: Optional[VectorStore] = None
+
+
+def get_store() -> VectorStore:
+    """Process-wide store for the configured `VECTOR_BACKEND`."""
+    global _store
+    if _store is None:
+        backend = settings.VECTOR_BACKEND
+        if backend == "qdrant":
+            from infra.rag.qdrant_client import QdrantVectorStore
+            _store = QdrantVectorStore()
+        elif backend == "local":
+            from infra.rag.local_store import LocalVectorStore
+            _store = LocalVectorStore(settings.VECTOR_STORE_PATH)
+        else:
+            raise ValueError(f"Unknown VECTOR_BACKEND '{backend}' (expected 'qdrant' or 'local')")
+    return _store
+
+
+async def close_store() -> None:
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+
+@contextmanager
+def _observed(op: str, collection: str) -> Iterator[None]:
+    with VECTOR_STORE_SECONDS.time(backend=settings.VECTOR_BACKEND, op=op,
+                                   collection=collection, outcome="error") as labels:
+        yield
+        labels["outcome"] = "ok"
+
+
+def stable_point_id(job_key: str, doc_type: str, text: str, source: str = "", chunk_index: int = -1) -> str:
+    raw = f"{job_key}|{doc_type}|{source}|{chunk_index}|{text}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _chunk_filters(job_key: str, doc_type: str, source: str, indices: Iterable[int]) -> Filters:
+    return {"job_key": [job_key], "doc_type": [doc_type], "source": [source],
+            "chunk_index": sorted(set(indices))}
+
+
+async def ensure_collection(name: str, vector_size: int = 1536):
+    with _observed("ensure_collection", name):
+        await get_store().ensure_collection(name, vector_size)
+
+
+async def list_collections() -> List[str]:
+    with _observed("list_collections", ""):
+        return await get_store().list_collections()
+
+
+async def upsert_texts_with_ids(collection: str, vectors: list[list[float]], payloads: list[dict]):
+    points = [
+        {
+            "id": stable_point_id(p["job_key"], p["doc_type"], p["text"],
+                             p.get("source", ""), p.get("chunk_index", -1)),
+            "vector": v,
+            "payload": p,
+        }
+        for v, p in zip(vectors, payloads)
+    ]
+    with _observed("upsert", collection):
+        await get_store().upsert(collection, points)
+
+
+async def upsert_points_batch(collection: str, points: List[Dict]):
+    if not points:
+        return
+    with _observed("upsert", collection):
+        await get_store().upsert(collection, points)
+
+
+async def delete_points(collection: str, ids: Iterable[str]):
+    ids = list(ids)
+    if ids:
+        with _observed("delete", collection):
+            await get_store().delete(collection, ids)
+
+
+async def search_top_k_filtered(
+    collection: str,
+    query_vector: list[float],
+    k: int,
+    job_key: Optional[str] = None,
+    doc_types: Optional[Iterable[str]] = None,
+):
+    filters: Filters = {}
+    if job_key:
+        filters["job_key"] = [job_key]
+    if doc_types:
+        filters["doc_type"] = list(doc_types)
+    with _observed("search", collection):
+        return await get_store().search(collection, query_vector, k, filters or None)
+
+
+async def scroll_points(
+    collection: str,
+    doc_types: Optional[Iterable[str]] = None,
+    with_vectors: bool = False,
+) -> List[Dict]:
+    """Return every point of `collection` (optionally filtered by doc_type) as {"payload", "vector"}."""
+    filters = {"doc_type": list(doc_types)} if doc_types else None
+    with _observed("scroll", collection):
+        return await get_store().scroll(collection, filters, with_vectors=with_vectors)
+
+
+async def fetch_neighbors_by_index(
+    collection: str,
+    job_key: str,
+    doc_type: str,
+    source: str,
+    center_index: int,
+    radius: int = 1,
+):
+    """Return chunks with chunk_index in [center_index - radius, center_index + radius] from same doc."""
+    return await fetch_chunks_by_indices(
+        collection, job_key, doc_type, source,
+        range(max(0, center_index - radius), center_index + radius + 1))
+
+
+async def fetch_chunks_by_indices(
+    collection: str,
+    job_key: str,
+    doc_type: str,
+    source: str,
+    indices: Iterable[int],
+):
+    """Return every chunk of one document whose chunk_index is in `indices`, in a single filtered scroll."""
+    flt = _chunk_filters(job_key, doc_type, source, indices)
+    if not flt["chunk_index"]:
+        return []
+    with _observed("scroll", collection):
+        out = [p["payload"] for p in await get_store().scroll(collection, flt)]
+    out.sort(key=lambda x: x.get("chunk_index", 0))
+    return out
@@ -0,0 +1,54 @@
+import uuid
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from infra.db.session import AsyncSessionLocal
+from infra.db.models import BatchRecord, JobRecord
+from infra.metrics.instruments import observe_write
+
+
+class AsyncBatchesRepository:
+    @observe_write("batches", "create_batch")
+    async def create_batch(self, job_title: str, items: List[Tuple[str, str]]) -> Tuple[str, List[str]]:
+        """Create the batch row and one queued job per (cv_id, report_id) in a single commit."""
+        bid = f"batch_{uuid.uuid4().hex}"
+        job_ids = [f"job_{uuid.uuid4().hex}" for _ in items]
+        async with AsyncSessionLocal() as s:
+            s.add(BatchRecord(id=bid, status="queued", job_title=job_title))
+            await s.flush()
+            for jid, (cv_id, report_id) in zip(job_ids, items):
+                s.add(JobRecord(id=jid, status="queued", job_title=job_title,
+                                cv_file_id=cv_id, report_file_id=report_id,
+                                batch_id=bid))
+            await s.commit()
+        return bid, job_ids
+
+    @observe_write("batches", "update_status")
+    async def update_status(self, batch_id: str, status: str, error: Optional[str] = None) -> None:
+        async with AsyncSessionLocal() as s:
+            batch = await s.get(BatchRecord, batch_id)
+            if not batch:
+                return
+            batch.status = status
+            batch.error = error
+            await s.commit()
+
+    async def get(self, batch_id: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as s:
+            batch = await s.get(BatchRecord, batch_id)
+            if not batch:
+                return None
+            rows = (await s.execute(
+                select(JobRecord.id, JobRecord.status).where(JobRecord.batch_id == batch_id)
+            )).all()
+            counts = {"queued": 0, "processing": 0, "completed": 0, "failed": 0}
+            for _, status in rows:
+                counts[status] = counts.get(status, 0) + 1
+            return {
+                "id": batch.id,
+                "status": batch.status,
+                "job_title": batch.job_title,
+                "error": batch.error,
+                "total": len(rows),
+                **counts,
+                "job_ids": [jid for jid, _ in rows],
+            }
@@ -0,0 +1,30 @@
+from infra.db.session import AsyncSessionLocal, SessionLocal
+from infra.db.models import CorpusStateRecord
+from infra.metrics.instruments import observe_write
+
+
+class CorpusRepository:
+    """Monotonic corpus version, bumped by ingestion so derived caches can invalidate."""
+
+    def get_version(self) -> int:
+        with SessionLocal() as s:
+            rec = s.get(CorpusStateRecord, 1)
+            return rec.version if rec else 0
+
+    @observe_write("corpus", "bump_version")
+    def bump_version(self) -> int:
+        with SessionLocal() as s:
+            rec = s.get(CorpusStateRecord, 1)
+            if not rec:
+                rec = CorpusStateRecord(id=1, version=0)
+                s.add(rec)
+            rec.version += 1
+            s.commit()
+            return rec.version
+
+
+class AsyncCorpusRepository:
+    async def get_version(self) -> int:
+        async with AsyncSessionLocal() as s:
+            rec = await s.get(CorpusStateRecord, 1)
+            return rec.version if rec else 0
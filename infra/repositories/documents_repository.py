@@ -0,0 +1,31 @@
+from typing import Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from infra.db.session import AsyncSessionLocal
+from infra.db.models import DocumentTextRecord
+from infra.metrics.instruments import observe_write
+
+
+class AsyncDocumentTextsRepository:
+    async def get(self, content_hash: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as s:
+            rec = await s.get(DocumentTextRecord, content_hash)
+            if not rec:
+                return None
+            return {"content_hash": rec.content_hash, "text": rec.text,
+                    "page_count": rec.page_count, "char_count": rec.char_count,
+                    "word_count": rec.word_count}
+
+    @observe_write("document_texts", "save")
+    async def save(self, content_hash: str, text: str, page_count: int) -> None:
+        async with AsyncSessionLocal() as s:
+            s.add(DocumentTextRecord(
+                content_hash=content_hash,
+                text=text,
+                page_count=page_count,
+                char_count=len(text),
+                word_count=len(text.split()),
+            ))
+            try:
+                await s.commit()
+            except IntegrityError:
+                await s.rollback()  # same content already extracted
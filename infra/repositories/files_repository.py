@@ -1,22 +1,44 @@
 import uuid
-from infra.db.session import SessionLocal
+from typing import Dict, Iterable, Optional, Set
+from sqlalchemy import select
+from infra.db.session import AsyncSessionLocal
 from infra.db.models import FileRecord
+from infra.metrics.instruments import observe_write
 
-class FilesRepository:
-    def save(self, ftype: str, path: str, name: str) -> str:
+
+def _to_dict(rec: FileRecord) -> Dict:
+    return {"id": rec.id, "type": rec.type, "path": rec.path,
+            "name": rec.name, "content_hash": rec.content_hash}
+
+
+class AsyncFilesRepository:
+    @observe_write("files", "save")
+    async def save(self, ftype: str, path: str, name: str, content_hash: Optional[str] = None) -> str:
         fid = f"file_{uuid.uuid4().hex}"
-        with SessionLocal() as s:
-            s.add(FileRecord(id=fid, type=ftype, path=path, name=name))
-            s.commit()
+        async with AsyncSessionLocal() as s:
+            s.add(FileRecord(id=fid, type=ftype, path=path, name=name,
+                             content_hash=content_hash))
+            await s.commit()
         return fid
 
-    def exists(self, file_id: str) -> bool:
-        with SessionLocal() as s:
-            return s.get(FileRecord, file_id) is not None
+    async def exists(self, file_id: str) -> bool:
+        async with AsyncSessionLocal() as s:
+            return await s.get(FileRecord, file_id) is not None
 
-    def get_path(self, file_id: str) -> str:
-        with SessionLocal() as s:
-            rec = s.get(FileRecord, file_id)
+    async def existing_ids(self, file_ids: Iterable[str]) -> Set[str]:
+        ids = set(file_ids)
+        async with AsyncSessionLocal() as s:
+            rows = await s.execute(select(FileRecord.id).where(FileRecord.id.in_(ids)))
+            return set(rows.scalars())
+
+    async def get_path(self, file_id: str) -> str:
+        async with AsyncSessionLocal() as s:
+            rec = await s.get(FileRecord, file_id)
             if not rec:
                 raise KeyError("file not found")
-            return rec.path
\ No newline at end of file
+            return rec.path
+
+    async def get(self, file_id: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as s:
+            rec = await s.get(FileRecord, file_id)
+            return _to_dict(rec) if rec else None
@@ -1,8 +1,9 @@
 import uuid
 import json
 from typing import Optional, Dict, Any
-from infra.db.session import SessionLocal
+from infra.db.session import AsyncSessionLocal
 from infra.db.models import JobRecord, JobResultRecord
+from infra.metrics.instruments import observe_write
 
 
 def _to_text(val: Any) -> Optional[str]:
@@ -15,67 +16,76 @@ def _to_text(val: Any) -> Optional[str]:
     return str(val)
 
 
-class JobsRepository:
-    def create_job(self, job_title: str, cv_id: str, report_id: str) -> str:
+def _result_record(job_id: str, result: Dict) -> JobResultRecord:
+    return JobResultRecord(
+        job_id=job_id,
+        cv_match_rate=float(result.get("cv_match_rate") or 0.0),
+        cv_feedback=_to_text(result.get("cv_feedback")),
+        project_score=float(result.get("project_score") or 0.0),
+        project_feedback=_to_text(result.get("project_feedback")),
+        overall_summary=_to_text(result.get("overall_summary")),
+    )
+
+
+def _job_dict(job: JobRecord, jr: Optional[JobResultRecord]) -> Dict:
+    out = {"id": job.id, "status": job.status,
+           "result": None, "error": None}
+    if jr and job.status == "completed":
+        out["result"] = {
+            "cv_match_rate": jr.cv_match_rate,
+            "cv_feedback": jr.cv_feedback,
+            "project_score": jr.project_score,
+            "project_feedback": jr.project_feedback,
+            "overall_summary": jr.overall_summary,
+        }
+    if jr and job.status == "failed" and jr.overall_summary:
+        out["error"] = jr.overall_summary
+    return out
+
+
+class AsyncJobsRepository:
+    @observe_write("jobs", "create_job")
+    async def create_job(self, job_title: str, cv_id: str, report_id: str) -> str:
         jid = f"job_{uuid.uuid4().hex}"
-        with SessionLocal() as s:
+        async with AsyncSessionLocal() as s:
             s.add(JobRecord(id=jid, status="queued", job_title=job_title,
                             cv_file_id=cv_id, report_file_id=report_id))
-            s.commit()
+            await s.commit()
         return jid
 
-    def update_status(self, job_id: str, status: str) -> None:
-        with SessionLocal() as s:
-            job = s.get(JobRecord, job_id)
+    @observe_write("jobs", "update_status")
+    async def update_status(self, job_id: str, status: str) -> None:
+        async with AsyncSessionLocal() as s:
+            job = await s.get(JobRecord, job_id)
             if not job:
                 return
             job.status = status
-            s.commit()
+            await s.commit()
 
-    def complete(self, job_id: str, result: Dict) -> None:
-        with SessionLocal() as s:
-            job = s.get(JobRecord, job_id)
+    @observe_write("jobs", "complete")
+    async def complete(self, job_id: str, result: Dict) -> None:
+        async with AsyncSessionLocal() as s:
+            job = await s.get(JobRecord, job_id)
             if not job:
                 return
             job.status = "completed"
-            jr = JobResultRecord(
-                job_id=job_id,
-                cv_match_rate=float(result.get("cv_match_rate") or 0.0),
-                cv_feedback=_to_text(result.get("cv_feedback")),
-                project_score=float(result.get("project_score") or 0.0),
-                project_feedback=_to_text(result.get("project_feedback")),
-                overall_summary=_to_text(result.get("overall_summary")),
-            )
-            s.add(jr)
-            s.commit()
+            await s.merge(_result_record(job_id, result))
+            await s.commit()
 
-    def fail(self, job_id: str, error: str) -> None:
-        with SessionLocal() as s:
-            job = s.get(JobRecord, job_id)
+    @observe_write("jobs", "fail")
+    async def fail(self, job_id: str, error: str) -> None:
+        async with AsyncSessionLocal() as s:
+            job = await s.get(JobRecord, job_id)
             if not job:
                 return
             job.status = "failed"
-            jr = JobResultRecord(
-                job_id=job_id, overall_summary=f"ERROR: {error}")
-            s.merge(jr)
-            s.commit()
+            await s.merge(JobResultRecord(
+                job_id=job_id, overall_summary=f"ERROR: {error}"))
+            await s.commit()
 
-    def get(self, job_id: str) -> Optional[Dict]:
-        with SessionLocal() as s:
-            job = s.get(JobRecord, job_id)
+    async def get(self, job_id: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as s:
+            job = await s.get(JobRecord, job_id)
             if not job:
                 return None
-            jr = s.get(JobResultRecord, job_id)
-            out = {"id": job.id, "status": job.status,
-                   "result": None, "error": None}
-            if jr and job.status == "completed":
-                out["result"] = {
-                    "cv_match_rate": jr.cv_match_rate,
-                    "cv_feedback": jr.cv_feedback,
-                    "project_score": jr.project_score,
-                    "project_feedback": jr.project_feedback,
-                    "overall_summary": jr.overall_summary,
-                }
-            if jr and job.status == "failed" and jr.overall_summary:
-                out["error"] = jr.overall_summary
-            return out
+            return _job_dict(job, await s.get(JobResultRecord, job_id))
@@ -0,0 +1,42 @@
+import json
+from typing import Dict, List, Optional
+from infra.db.session import SessionLocal
+from infra.db.models import IngestManifestRecord
+from infra.metrics.instruments import observe_write
+
+
+class IngestManifestRepository:
+    """What was last ingested per (collection, job_key, doc_type, source), for incremental runs."""
+
+    def get(self, collection: str, job_key: str, doc_type: str, source: str) -> Optional[Dict]:
+        with SessionLocal() as s:
+            rec = s.get(IngestManifestRecord, (collection, job_key, doc_type, source))
+            if not rec:
+                return None
+            return {
+                "file_hash": rec.file_hash,
+                "params": rec.params,
+                "embedding_model": rec.embedding_model,
+                "point_ids": json.loads(rec.point_ids),
+                "meta": json.loads(rec.meta) if rec.meta else None,
+            }
+
+    @observe_write("ingest_manifest", "put")
+    def put(self, collection: str, job_key: str, doc_type: str, source: str, *, file_hash: str,
+            params: str, embedding_model: str, point_ids: List[str], meta: Optional[Dict] = None) -> None:
+        with SessionLocal() as s:
+            s.merge(IngestManifestRecord(
+                collection=collection, job_key=job_key, doc_type=doc_type, source=source,
+                file_hash=file_hash, params=params, embedding_model=embedding_model,
+                point_ids=json.dumps(point_ids),
+                meta=json.dumps(meta, ensure_ascii=False) if meta is not None else None,
+            ))
+            s.commit()
+
+    @observe_write("ingest_manifest", "delete")
+    def delete(self, collection: str, job_key: str, doc_type: str, source: str) -> None:
+        with SessionLocal() as s:
+            rec = s.get(IngestManifestRecord, (collection, job_key, doc_type, source))
+            if rec:
+                s.delete(rec)
+                s.commit()
@@ -0,0 +1,26 @@
+import json
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from infra.db.session import AsyncSessionLocal
+from infra.db.models import ResultCacheRecord
+from infra.metrics.instruments import observe_write
+
+
+class AsyncResultCacheRepository:
+    async def get(self, key: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as s:
+            rec = await s.get(ResultCacheRecord, key)
+            return json.loads(rec.result) if rec else None
+
+    @observe_write("result_cache", "put")
+    async def put(self, key: str, result: Dict) -> None:
+        # Single-statement upsert: identical forced refreshes may write the same key concurrently.
+        stmt = insert(ResultCacheRecord).values(key=key, result=json.dumps(result, ensure_ascii=False))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ResultCacheRecord.key],
+            set_={"result": stmt.excluded.result, "created_at": func.now()},
+        )
+        async with AsyncSessionLocal() as s:
+            await s.execute(stmt)
+            await s.commit()
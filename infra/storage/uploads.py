@@ -0,0 +1,62 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import Tuple
+
+from fastapi import UploadFile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _commit(tmp_path: str, final_path: str) -> None:
+    if os.path.exists(final_path):
+        _remove_quietly(tmp_path)  # identical content already stored
+    else:
+        os.replace(tmp_path, final_path)
+
+
+async def store_upload(f: UploadFile, storage_dir: str, max_bytes: int) -> Tuple[str, str, int]:
+    """Stream an upload to disk in chunks, hashing on the fly.
+
+    The file is stored content-addressed as `<sha256>.pdf`, so identical uploads
+    share one file and different files with the same name never collide.
+    Returns (path, sha256, size).
+    """
+    tmp_path = os.path.join(storage_dir, f".upload-{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    out = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        while True:
+            chunk = await f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        await asyncio.to_thread(_remove_quietly, tmp_path)
+        raise
+    await asyncio.to_thread(out.close)
+
+    content_hash = digest.hexdigest()
+    path = os.path.join(storage_dir, f"{content_hash}.pdf")
+    await asyncio.to_thread(_commit, tmp_path, path)
+    return path, content_hash, size
@@ -1,18 +1,25 @@
 import os
 import re
+import json
+import time
+import hashlib
 import uuid
 import asyncio
-import pdfplumber
 import logging
-from typing import List
-from infra.rag.embeddings import embed_texts_openai
-from infra.rag.qdrant_client import (
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from app.settings import settings
+from infra.pdf.extraction import pdf_extractor
+from infra.rag.embeddings import embed_texts_openai, embedding_dimensions, embedding_usage
+from infra.rag.vector_store import (
     COLLECTION_CATALOG, ensure_collection, upsert_points_batch, upsert_texts_with_ids,
-    COLLECTION_CV, COLLECTION_PROJECT
+    COLLECTION_CV, COLLECTION_PROJECT, delete_points, stable_point_id
 )
 from infra.llm.client import generate_job_catalog_metadata
+from infra.db.session import init_db
+from infra.repositories.corpus_repository import CorpusRepository
+from infra.repositories.manifest_repository import IngestManifestRepository
 
-VECTOR_SIZE = 1536
 HEADER_CELLS = {"parameter", "description", "scoring guide"}
 
 log = logging.getLogger("ingest_all")
@@ -24,16 +31,29 @@ for noisy_logger in ("httpx", "httpcore.httpx", "qdrant_client.http"):
     logging.getLogger(noisy_logger).setLevel(logging.WARNING)
 
 
-def read_pdf_text(path: str, max_pages: int | None = None) -> str:
-    parts: List[str] = []
-    with pdfplumber.open(path) as pdf:
-        pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
-        for p in pages:
-            parts.append(p.extract_text() or "")
-    text = "\n".join(parts)
+# Directory mode runs several role bundles at once; these bound the shared
+# PDF worker pool and the catalog LLM calls across all of them.
+_pdf_slots = asyncio.Semaphore(4)
+_llm_slots = asyncio.Semaphore(2)
+
+
+def configure_limits(pdf: int, llm: int) -> None:
+    global _pdf_slots, _llm_slots
+    _pdf_slots = asyncio.Semaphore(max(1, pdf))
+    _llm_slots = asyncio.Semaphore(max(1, llm))
+
+
+async def read_pdf_text(path: str, max_pages: int | None = None) -> str:
+    async with _pdf_slots:
+        text = await pdf_extractor.extract_text(path, max_pages=max_pages)
     return re.sub(r"\s+\n", "\n", text)
 
 
+async def read_rubric_markdown(path: str) -> str:
+    async with _pdf_slots:
+        return await pdf_extractor.extract_rubric_markdown(path)
+
+
 def chunk_text(text: str, size=1000, overlap=150) -> List[str]:
     out, i = [], 0
     n = len(text)
@@ -52,10 +72,11 @@ def make_point_id(job_key: str, term: str, idx: int) -> str:
 
 async def upsert_catalog(jd_pdf_path: str) -> dict:
     """Use LLM to create catalog metadata from JD text. Embed title + each alias separately."""
-    ensure_collection(COLLECTION_CATALOG, vector_size=VECTOR_SIZE)
-    jd_first_pages = read_pdf_text(jd_pdf_path, max_pages=2)
+    await ensure_collection(COLLECTION_CATALOG, vector_size=embedding_dimensions())
+    jd_first_pages = await read_pdf_text(jd_pdf_path, max_pages=2)
     raw = f"FILE: {os.path.basename(jd_pdf_path)}\n\n{jd_first_pages[:2000]}"
-    meta = await generate_job_catalog_metadata(raw)
+    async with _llm_slots:
+        meta = await generate_job_catalog_metadata(raw)
 
     # Collect all searchable terms: title + all aliases
     searchable_terms = [meta['title']] + meta['aliases']
@@ -87,7 +108,7 @@ async def upsert_catalog(jd_pdf_path: str) -> dict:
             "payload": payload
         })
 
-    upsert_points_batch(COLLECTION_CATALOG, points)
+    await upsert_points_batch(COLLECTION_CATALOG, points)
 
     log.info(
         f"Catalog upserted: {meta['title']} → job_key={meta['job_key']} "
@@ -96,126 +117,249 @@ async def upsert_catalog(jd_pdf_path: str) -> dict:
     return meta
 
 
-async def ingest_jd_chunks(job_key: str, jd_pdf_path: str):
-    ensure_collection(COLLECTION_CV, vector_size=VECTOR_SIZE)
-    raw = read_pdf_text(jd_pdf_path)
-    chunks = chunk_text(raw, size=1000, overlap=150)
-    vecs = await embed_texts_openai(chunks)
-    payloads = [{
-        "text": t,
-        "doc_type": "jd_chunk",
-        "job_key": job_key,
-        "source": os.path.basename(jd_pdf_path),
-        "chunk_index": i
-    } for i, t in enumerate(chunks)]
-    upsert_texts_with_ids(COLLECTION_CV, vecs, payloads)
-    log.info(f"Ingested {len(chunks)} JD chunks for job_key={job_key}")
-
-
-async def ingest_case_brief(job_key: str, brief_pdf_path: str):
-    ensure_collection(COLLECTION_PROJECT, vector_size=VECTOR_SIZE)
-    raw = read_pdf_text(brief_pdf_path)
-    chunks = chunk_text(raw, size=1000, overlap=150)
-    vecs = await embed_texts_with_openai_safe(chunks)
-    payloads = [{
-        "text": t,
-        "doc_type": "case_brief",
-        "job_key": job_key,
-        "source": os.path.basename(brief_pdf_path),
-        "chunk_index": i
-    } for i, t in enumerate(chunks)]
-    upsert_texts_with_ids(COLLECTION_PROJECT, vecs, payloads)
-    log.info(f"Ingested {len(chunks)} case-brief chunks for job_key={job_key}")
-
-
-async def ingest_rubric(job_key: str, rubric_pdf_path: str):
-    ensure_collection(COLLECTION_PROJECT, vector_size=VECTOR_SIZE)
-
-    md = []
-    with pdfplumber.open(rubric_pdf_path) as pdf:
-        for page in pdf.pages:
-            words = page.extract_words()
-            tables = page.extract_tables() or []
-
-            table_bboxes = []
-            for tbl_obj in page.find_tables():
-                table_bboxes.append(tbl_obj.bbox)
-
-            lines_with_pos = []
-            current_line = []
-            current_y = None
-
-            for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
-                if current_y is None or abs(word['top'] - current_y) < 3:
-                    current_line.append(word['text'])
-                    current_y = word['top']
-                else:
-                    if current_line:
-                        line_text = ' '.join(current_line).strip()
-                        if line_text:
-                            lines_with_pos.append((current_y, line_text))
-                    current_line = [word['text']]
-                    current_y = word['top']
-
-            if current_line:
-                line_text = ' '.join(current_line).strip()
-                if line_text:
-                    lines_with_pos.append((current_y, line_text))
-
-            content_items = []
-
-            for y_pos, line in lines_with_pos:
-                if any(kw in line for kw in ['Rubric', 'Evaluation', 'scale per parameter']):
-                    content_items.append(('header', y_pos, line))
-
-            for i, (tbl, bbox) in enumerate(zip(tables, table_bboxes)):
-                content_items.append(('table', bbox[1], tbl))
-
-            content_items.sort(key=lambda x: x[1])
-
-            def is_header(cells: List[str]) -> bool:
-                s = set([c.lower() for c in cells])
-                return {"parameter", "description", "scoring guide"} <= s
-
-            for item_type, y_pos, content in content_items:
-                if item_type == 'header':
-                    md.append(f"## {content}\n")
-
-                elif item_type == 'table':
-                    rows = [[cell.strip() if cell else "" for cell in row]
-                            for row in content if row]
-
-                    for r in rows:
-                        if not any(r) or is_header(r):
-                            continue
-
-                        param = re.sub(r"\(.*?weight.*?\)", "",
-                                       r[0], flags=re.I).strip()
-                        if not param:
-                            continue
+# Reference documents per bundle: (bundle field, collection, doc_type, chunk size, overlap).
+DOCUMENT_KINDS = [
+    ("jd", COLLECTION_CV, "jd_chunk", 1000, 150),
+    ("brief", COLLECTION_PROJECT, "case_brief", 1000, 150),
+    ("rubric", COLLECTION_PROJECT, "rubric", 1800, 200),
+]
+
+# <Role>_JobDesc.pdf, <Role>_CaseStudy.pdf, <Role>_Rubric.pdf
+BUNDLE_FILE = re.compile(r"^(?P<role>.+?)_(?P<kind>JobDesc|CaseStudy|Rubric)\.pdf$", re.I)
+BUNDLE_FIELDS = {"jobdesc": "jd", "casestudy": "brief", "rubric": "rubric"}
+
+
+@dataclass
+class RoleBundle:
+    role: str
+    jd: Optional[str] = None
+    brief: Optional[str] = None
+    rubric: Optional[str] = None
+
+
+@dataclass
+class IngestTotals:
+    roles: int = 0
+    docs: int = 0
+    chunks: int = 0
+    skipped_docs: int = 0
+    embedded_chunks: int = 0
+    deleted_chunks: int = 0
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.docs > self.skipped_docs or self.embedded_chunks > 0 or self.deleted_chunks > 0
+
+
+manifest = IngestManifestRepository()
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _embedding_signature() -> str:
+    return f"{settings.OPENAI_EMBEDDING_MODEL}:{settings.OPENAI_EMBEDDING_DIMENSIONS or 'native'}"
+
+
+def discover_bundles(directory: str, default_brief: Optional[str] = None) -> List[RoleBundle]:
+    """Group `<Role>_{JobDesc,CaseStudy,Rubric}.pdf` files in `directory` by role.
+
+    Roles without their own case study use `default_brief` when given.
+    """
+    bundles: Dict[str, RoleBundle] = {}
+    for name in sorted(os.listdir(directory)):
+        m = BUNDLE_FILE.match(name)
+        if not m:
+            continue
+        bundle = bundles.setdefault(m["role"], RoleBundle(role=m["role"]))
+        setattr(bundle, BUNDLE_FIELDS[m["kind"].lower()], os.path.join(directory, name))
+
+    out = []
+    for bundle in bundles.values():
+        if not bundle.jd:
+            log.warning(f"Skipping role '{bundle.role}': no JobDesc PDF")
+            continue
+        if not bundle.brief:
+            bundle.brief = default_brief
+        missing = [k for k in ("brief", "rubric") if not getattr(bundle, k)]
+        if missing:
+            log.warning(f"Role '{bundle.role}' has no {'/'.join(missing)} PDF; ingesting the rest")
+        out.append(bundle)
+    return out
 
-                        desc = r[1] if len(r) > 1 else ""
-                        guide = r[2] if len(r) > 2 else ""
 
-                        md += [f"### {param}",
-                               f"**Description:** {desc}" if desc else "",
-                               f"**Guide:** {guide}" if guide else "",
-                               ""]
+async def _document_chunks(path: str, doc_type: str, size: int, overlap: int) -> List[str]:
+    raw = await (read_rubric_markdown(path) if doc_type == "rubric" else read_pdf_text(path))
+    return chunk_text(raw, size=size, overlap=overlap)
+
+
+def reusable_catalog(jd_pdf_path: str, jd_hash: str, force: bool) -> Optional[dict]:
+    """Manifest catalog metadata for a JD whose file and models are unchanged, else None."""
+    prev = manifest.get(COLLECTION_CATALOG, "", "job_catalog", os.path.basename(jd_pdf_path))
+    if (not force and prev and prev["meta"] and prev["file_hash"] == jd_hash
+            and prev["params"] == f"catalog:{settings.OPENAI_MODEL}"
+            and prev["embedding_model"] == _embedding_signature()):
+        return prev["meta"]
+    return None
+
+
+async def catalog_for(jd_pdf_path: str, jd_hash: str, force: bool, totals: IngestTotals) -> dict:
+    """Catalog metadata for a JD; reused from the manifest when the JD and models are unchanged."""
+    source = os.path.basename(jd_pdf_path)
+    params = f"catalog:{settings.OPENAI_MODEL}"
+    reused = reusable_catalog(jd_pdf_path, jd_hash, force)
+    if reused is not None:
+        log.info(f"Catalog unchanged for {source} → job_key={reused['job_key']}")
+        return reused
+    prev = manifest.get(COLLECTION_CATALOG, "", "job_catalog", source)
+
+    meta = await upsert_catalog(jd_pdf_path=jd_pdf_path)
+    terms = [meta["title"]] + meta["aliases"]
+    ids = [make_point_id(meta["job_key"], term, idx) for idx, term in enumerate(terms)]
+    stale = set(prev["point_ids"]) - set(ids) if prev else set()
+    await delete_points(COLLECTION_CATALOG, stale)
+    totals.embedded_chunks += len(ids)
+    totals.deleted_chunks += len(stale)
+    manifest.put(COLLECTION_CATALOG, "", "job_catalog", source, file_hash=jd_hash, params=params,
+                 embedding_model=_embedding_signature(), point_ids=ids, meta=meta)
+    return meta
 
-    consolidated = "\n".join([x for x in md if x])
 
-    blocks = chunk_text(consolidated, size=1800, overlap=200)
-    vecs = await embed_texts_with_openai_safe(blocks)
+async def _plan_document(job_key: str, path: str, file_hash: str, collection: str, doc_type: str,
+                         size: int, overlap: int, force: bool,
+                         extracted: Optional["asyncio.Task[List[str]]"] = None,
+                         ) -> Optional[Tuple[List[dict], List[dict], set, Dict]]:
+    """Work needed to bring one document up to date, or None if the manifest says it is current.
+
+    `extracted` is a chunking task started ahead of time (while the catalog LLM
+    call ran); it is used instead of parsing the file here.
+    Returns (all payloads, payloads needing embedding, stale point ids, manifest fields).
+    """
+    source = os.path.basename(path)
+    params = f"chunk:{size}:{overlap}"
+    prev = manifest.get(collection, job_key, doc_type, source)
+    same_model = bool(prev) and prev["embedding_model"] == _embedding_signature()
+    if not force and same_model and prev["file_hash"] == file_hash and prev["params"] == params:
+        if extracted is not None:
+            extracted.cancel()
+        return None
+
+    chunks = await (extracted if extracted is not None else _document_chunks(path, doc_type, size, overlap))
     payloads = [{
-        "text": blk,
-        "doc_type": "rubric",
+        "text": t,
+        "doc_type": doc_type,
         "job_key": job_key,
-        "source": os.path.basename(rubric_pdf_path),
+        "source": source,
         "chunk_index": i,
-        "format": "markdown"
-    } for i, blk in enumerate(blocks)]
-    upsert_texts_with_ids(COLLECTION_PROJECT, vecs, payloads)
-    log.info(f"Ingested {len(blocks)} rubric blocks for job_key={job_key}")
+        **({"format": "markdown"} if doc_type == "rubric" else {}),
+    } for i, t in enumerate(chunks)]
+    ids = [stable_point_id(job_key, doc_type, p["text"], source, p["chunk_index"]) for p in payloads]
+
+    # Point ids hash (text, position), so an id already present was embedded from identical input.
+    kept = set(prev["point_ids"]) if (prev and same_model and not force) else set()
+    fresh = [p for p, pid in zip(payloads, ids) if pid not in kept]
+    stale = (set(prev["point_ids"]) - set(ids)) if prev else set()
+    fields = {"file_hash": file_hash, "params": params,
+              "embedding_model": _embedding_signature(), "point_ids": ids}
+    return payloads, fresh, stale, fields
+
+
+async def _drop_replaced_job_key(old_key: str, docs: List[Tuple], totals: IngestTotals) -> None:
+    """Delete the points and manifest entries this bundle's documents left under a job_key it no longer uses."""
+    for path, collection, doc_type, _, _ in docs:
+        source = os.path.basename(path)
+        prev = manifest.get(collection, old_key, doc_type, source)
+        if not prev:
+            continue
+        await delete_points(collection, prev["point_ids"])
+        totals.deleted_chunks += len(prev["point_ids"])
+        manifest.delete(collection, old_key, doc_type, source)
+
+
+async def ingest_bundle(bundle: RoleBundle, totals: IngestTotals, force: bool = False) -> dict:
+    """Catalog one role and bring its reference documents up to date.
+
+    Files whose hash, chunking parameters and embedding model match the
+    ingestion manifest are skipped without parsing. Changed files re-embed
+    only chunks whose (text, position) is new, in one packed call per bundle,
+    and points for chunks that no longer exist are deleted. If the JD now
+    resolves to a different job_key, the chunks stored under the old key are
+    deleted once the new ones are in place.
+    """
+    docs = [(getattr(bundle, attr), collection, doc_type, size, overlap)
+            for attr, collection, doc_type, size, overlap in DOCUMENT_KINDS
+            if getattr(bundle, attr)]
+    for collection in {d[1] for d in docs}:
+        await ensure_collection(collection, vector_size=embedding_dimensions())
+
+    paths = [bundle.jd] + [path for path, *_ in docs]
+    hashes = await asyncio.gather(*(asyncio.to_thread(file_sha256, p) for p in paths))
+    prev_catalog = manifest.get(COLLECTION_CATALOG, "", "job_catalog", os.path.basename(bundle.jd))
+    # A catalog LLM call is coming: parse the documents meanwhile rather than after it.
+    # (When the catalog is reused there is no wait to hide, and unchanged files are not parsed.)
+    extracted: List[Optional[asyncio.Task]] = [None] * len(docs)
+    if reusable_catalog(bundle.jd, hashes[0], force) is None:
+        extracted = [asyncio.create_task(_document_chunks(path, doc_type, size, overlap))
+                     for path, _, doc_type, size, overlap in docs]
+    try:
+        meta = await catalog_for(bundle.jd, hashes[0], force, totals)
+        job_key = meta["job_key"]
+        log.info(f"Using job_key={job_key}")
+
+        plans = await asyncio.gather(*(
+            _plan_document(job_key, path, file_hash, collection, doc_type, size, overlap, force, task)
+            for (path, collection, doc_type, size, overlap), file_hash, task in zip(docs, hashes[1:], extracted)
+        ))
+    finally:
+        leftovers = [task for task in extracted if task is not None]
+        for task in leftovers:
+            task.cancel()
+        await asyncio.gather(*leftovers, return_exceptions=True)
+
+    totals.docs += len(docs)
+    fresh_by_collection: Dict[str, List[dict]] = {}
+    for (path, collection, doc_type, _, _), plan in zip(docs, plans):
+        if plan is None:
+            totals.skipped_docs += 1
+            log.info(f"Unchanged {doc_type} {os.path.basename(path)}; skipped")
+            continue
+        payloads, fresh, stale, _ = plan
+        fresh_by_collection.setdefault(collection, []).extend(fresh)
+        totals.chunks += len(payloads)
+        log.info(f"Chunked {len(payloads)} {doc_type} blocks for job_key={job_key} "
+                 f"({len(fresh)} new/changed, {len(stale)} stale)")
+
+    all_fresh = [p for ps in fresh_by_collection.values() for p in ps]
+    vecs = await embed_texts_with_openai_safe([p["text"] for p in all_fresh])
+    offset = 0
+    for collection, payloads in fresh_by_collection.items():
+        await upsert_texts_with_ids(collection, vecs[offset:offset + len(payloads)], payloads)
+        offset += len(payloads)
+    totals.embedded_chunks += len(all_fresh)
+
+    for (path, collection, doc_type, _, _), plan in zip(docs, plans):
+        if plan is None:
+            continue
+        _, _, stale, fields = plan
+        await delete_points(collection, stale)
+        totals.deleted_chunks += len(stale)
+        manifest.put(collection, job_key, doc_type, os.path.basename(path), **fields)
+
+    old_key = ((prev_catalog or {}).get("meta") or {}).get("job_key")
+    if old_key and old_key != job_key:
+        log.info(f"JD now resolves to job_key={job_key}; removing chunks stored under {old_key}")
+        await _drop_replaced_job_key(old_key, docs, totals)
+
+    totals.roles += 1
+    log.info(
+        f"Catalog: {meta['title']} ({job_key}) | aliases={meta['aliases']} | tags={meta['tags']}")
+    return meta
 
 
 async def embed_texts_with_openai_safe(texts: List[str]):
@@ -225,29 +369,77 @@ async def embed_texts_with_openai_safe(texts: List[str]):
 
 
 #  main orchestrator
-async def main(jd_pdf: str, brief_pdf: str, rubric_pdf: str):
+async def run_ingestion(bundles: List[RoleBundle], workers: int = 1, fail_fast: bool = True,
+                        force: bool = False) -> IngestTotals:
+    """Ingest bundles with at most `workers` in flight, then bump the corpus version once if anything changed."""
+    init_db()
+    totals = IngestTotals()
+    slots = asyncio.Semaphore(max(1, workers))
+    started = time.perf_counter()
+    tokens_before = embedding_usage["tokens"]
+
+    async def one(bundle: RoleBundle) -> None:
+        async with slots:
+            try:
+                await ingest_bundle(bundle, totals, force=force)
+            except Exception:
+                if fail_fast:
+                    raise
+                log.exception(f"Ingestion failed for role '{bundle.role}'")
+                totals.failed.append(bundle.role)
+
+    try:
+        await asyncio.gather(*(one(b) for b in bundles))
+
+        if totals.changed:
+            # New reference documents invalidate cached results derived from the old corpus.
+            version = CorpusRepository().bump_version()
+            log.info(f"Corpus version bumped to {version}")
+    finally:
+        pdf_extractor.close()
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    tokens = embedding_usage["tokens"] - tokens_before
+    log.info(
+        f"Ingested {totals.roles} role(s), {totals.docs} docs, {totals.chunks} chunks in {elapsed:.1f}s | "
+        f"{totals.docs / elapsed:.2f} docs/s, {totals.chunks / elapsed:.1f} chunks/s, "
+        f"{tokens / elapsed:.0f} embed tokens/s"
+    )
+    log.info(
+        f"Incremental: {totals.skipped_docs}/{totals.docs} docs unchanged, "
+        f"{totals.embedded_chunks} points embedded, {totals.deleted_chunks} stale points deleted"
+    )
+    if totals.failed:
+        log.error(f"Failed roles: {', '.join(totals.failed)}")
+    return totals
+
+
+async def main(jd_pdf: str, brief_pdf: str, rubric_pdf: str, force: bool = False):
     for p in (jd_pdf, brief_pdf, rubric_pdf):
         if not (os.path.isfile(p) and p.lower().endswith(".pdf")):
             raise FileNotFoundError(f"Missing/invalid PDF: {p}")
 
-    meta = await upsert_catalog(jd_pdf_path=jd_pdf)
-
-    job_key = meta["job_key"]
-    log.info(f"Using job_key={job_key}")
+    role = os.path.splitext(os.path.basename(jd_pdf))[0]
+    await run_ingestion([RoleBundle(role=role, jd=jd_pdf, brief=brief_pdf, rubric=rubric_pdf)], force=force)
+    log.info(" Ingestion completed successfully.")
 
-    await ingest_jd_chunks(job_key, jd_pdf)
-    await ingest_case_brief(job_key, brief_pdf)
-    await ingest_rubric(job_key, rubric_pdf)
 
-    log.info(" Ingestion completed successfully.")
-    log.info(
-        f"Catalog: {meta['title']} ({job_key}) | aliases={meta['aliases']} | tags={meta['tags']}")
+async def main_dir(directory: str, workers: int, default_brief: Optional[str] = None,
+                   force: bool = False) -> IngestTotals:
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Missing corpus directory: {directory}")
+    if default_brief and not os.path.isfile(default_brief):
+        raise FileNotFoundError(f"Missing/invalid PDF: {default_brief}")
+    bundles = discover_bundles(directory, default_brief)
+    log.info(f"Discovered {len(bundles)} role bundle(s) in {directory}: "
+             f"{', '.join(b.role for b in bundles)}")
+    return await run_ingestion(bundles, workers=workers, fail_fast=False, force=force)
 
 
 async def generate_job_catalog_metadata_from_pdf(jd_pdf: str) -> dict:
     try:
-        ensure_collection(COLLECTION_CATALOG, vector_size=VECTOR_SIZE)
-        first_pages = read_pdf_text(jd_pdf, max_pages=2)[:2000]
+        await ensure_collection(COLLECTION_CATALOG, vector_size=embedding_dimensions())
+        first_pages = (await read_pdf_text(jd_pdf, max_pages=2))[:2000]
         raw = f"{os.path.basename(jd_pdf)}\n\n{first_pages}"
         meta = await generate_job_catalog_metadata(raw)
         return meta
@@ -258,11 +450,27 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(
         description="Ingest JD + Case Brief + Rubric with unified job_key")
-    parser.add_argument("--jd", required=True,
+    parser.add_argument("--jd",
                         help="Path to Job Description PDF")
-    parser.add_argument("--brief", required=True,
-                        help="Path to Case Study Brief PDF")
-    parser.add_argument("--rubric", required=True,
+    parser.add_argument("--brief",
+                        help="Path to Case Study Brief PDF (with --dir: fallback for roles without one)")
+    parser.add_argument("--rubric",
                         help="Path to Scoring Rubric PDF")
+    parser.add_argument("--dir",
+                        help="Ingest every <Role>_{JobDesc,CaseStudy,Rubric}.pdf bundle in this directory")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Role bundles ingested concurrently in --dir mode")
+    parser.add_argument("--pdf-concurrency", type=int, default=4,
+                        help="Concurrent PDF parses across bundles")
+    parser.add_argument("--llm-concurrency", type=int, default=2,
+                        help="Concurrent catalog-generation LLM calls")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the ingestion manifest and re-ingest every file")
     args = parser.parse_args()
-    asyncio.run(main(args.jd, args.brief, args.rubric))
+    configure_limits(pdf=args.pdf_concurrency, llm=args.llm_concurrency)
+    if args.dir:
+        totals = asyncio.run(main_dir(args.dir, args.workers, args.brief, force=args.full))
+        raise SystemExit(1 if totals.failed else 0)
+    if not (args.jd and args.brief and args.rubric):
+        parser.error("either --dir or all of --jd, --brief and --rubric are required")
+    asyncio.run(main(args.jd, args.brief, args.rubric, force=args.full))
@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+# Settings are read at import time: point every store at a throwaway directory
+# and disable real providers before any app module is imported.
+_workdir = tempfile.mkdtemp(prefix="cv-eval-tests-")
+os.environ.update({
+    "OPENAI_API_KEY": "",
+    "OPENROUTER_API_KEY": "",
+    "VECTOR_BACKEND": "local",
+    "VECTOR_STORE_PATH": os.path.join(_workdir, "vector_store"),
+    "SQLITE_PATH": os.path.join(_workdir, "app.sqlite3"),
+    "STORAGE_DIR": os.path.join(_workdir, "storage"),
+    "EMBED_CACHE_PATH": os.path.join(_workdir, "embedding_cache.sqlite3"),
+    "EVAL_LOG_PATH": os.path.join(_workdir, "evaluation.log"),
+})
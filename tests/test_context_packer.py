@@ -0,0 +1,44 @@
+from infra.rag.context_packer import estimate_tokens, fair_shares, fit_text, pack_references
+
+
+def _block(text, score, doc_type):
+    return {"text": text, "score": score, "doc_type": doc_type}
+
+
+def test_seeded_blocks_are_kept_whole_when_they_fit_together():
+    rubric = " ".join(["rubric"] * 857)[:6000]
+    jd = " ".join(["jd"] * 200)[:400]
+    budget = estimate_tokens(rubric) + estimate_tokens(jd) + 50
+    picked = pack_references([_block(rubric, 0.9, "rubric"), _block(jd, 0.8, "jd_chunk")], budget)
+    assert picked == [rubric, jd]
+
+
+def test_oversized_seed_gets_the_budget_a_short_one_leaves():
+    long_text = "word " * 3000
+    short = "short jd block"
+    picked = pack_references([_block(long_text, 0.9, "rubric"), _block(short, 0.8, "jd_chunk")], 1000)
+    assert picked[1] == short
+    used = sum(estimate_tokens(t) for t in picked)
+    assert 900 <= used <= 1000
+
+
+def test_lower_ranked_blocks_fill_what_the_seeds_leave():
+    picked = pack_references([
+        _block("a" * 400, 0.9, "rubric"),
+        _block("b" * 400, 0.5, "rubric"),
+        _block("c" * 400, 0.8, "jd_chunk"),
+    ], 1000)
+    assert picked == ["a" * 400, "c" * 400, "b" * 400]
+
+
+def test_fair_shares_caps_each_item_at_its_cost():
+    assert fair_shares([100, 1500], 2000) == [100, 1500]
+    assert fair_shares([100, 3000], 2000) == [100, 1900]
+    assert fair_shares([3000, 3000], 2000) == [1000, 1000]
+
+
+def test_fit_text_keeps_text_within_its_estimate():
+    for n in range(1, 50):
+        text = "x" * n
+        assert fit_text(text, estimate_tokens(text)) == text
+        assert estimate_tokens(fit_text("x" * 500, n)) <= n
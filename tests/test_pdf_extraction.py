@@ -0,0 +1,34 @@
+import asyncio
+
+from infra.pdf.extraction import PdfExtractionService
+
+
+def test_worker_replaced_after_close_is_not_respawned():
+    async def run():
+        service = PdfExtractionService(workers=2, timeout=1, pages_per_task=4)
+        service.start()
+        taken = await service._idle.get()
+        service.close()
+
+        service._replace(taken)
+
+        assert service._executors == []
+        assert service._idle is None
+
+    asyncio.run(run())
+
+
+def test_worker_replaced_while_open_is_respawned():
+    async def run():
+        service = PdfExtractionService(workers=2, timeout=1, pages_per_task=4)
+        service.start()
+        taken = await service._idle.get()
+
+        service._replace(taken)
+
+        assert taken not in service._executors
+        assert len(service._executors) == 2
+        assert service._idle.qsize() == 2
+        service.close()
+
+    asyncio.run(run())
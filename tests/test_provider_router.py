@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.settings import settings
+from infra.llm.provider_router import CLOSED, OPEN, ProviderRouter
+
+COOLDOWN = 0.05
+
+
+@pytest.fixture(autouse=True)
+def fast_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_MIN_CALLS", 2)
+    monkeypatch.setattr(settings, "LLM_BREAKER_COOLDOWN_SECONDS", COOLDOWN)
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", False)
+
+
+class FlakySender:
+    """Fails until `healthy` is set; counts concurrent and total calls."""
+
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.healthy = False
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, messages):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if not self.healthy:
+                raise RuntimeError("provider down")
+            return "ok"
+        finally:
+            self.active -= 1
+
+
+async def _trip(router, name):
+    health = router.health[name]
+    for _ in range(settings.LLM_BREAKER_MIN_CALLS):
+        health.record_failure()
+    assert health.state == OPEN
+    await asyncio.sleep(COOLDOWN * 1.5)
+
+
+def test_concurrent_calls_after_cooldown_send_a_single_probe():
+    async def run():
+        a, b = FlakySender(), FlakySender()
+        a.healthy = b.healthy = True
+        router = ProviderRouter([("a", a), ("b", b)])
+        await _trip(router, "a")
+
+        results = await asyncio.gather(*(router.call([], str) for _ in range(10)))
+
+        assert a.calls == 1
+        assert b.calls == 9
+        assert sorted(provider for provider, _ in results) == ["a"] + ["b"] * 9
+        assert router.health["a"].state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_single_provider_calls_wait_for_the_probe_outcome():
+    async def run():
+        a = FlakySender()
+        router = ProviderRouter([("a", a)])
+        await _trip(router, "a")
+        a.healthy = True
+
+        results = await asyncio.gather(*(router.call([], str) for _ in range(10)))
+
+        assert results == [("a", "ok")] * 10
+        # The probe runs alone; the rest only go out once it has closed the circuit.
+        assert a.calls == 10
+        assert a.peak == 9
+        assert router.health["a"].state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_cancelled_probe_gives_the_slot_back():
+    async def run():
+        a, b = FlakySender(delay=1), FlakySender()
+        a.healthy = b.healthy = True
+        router = ProviderRouter([("a", a), ("b", b)])
+        await _trip(router, "a")
+
+        probe = asyncio.create_task(router.call([], str))
+        await asyncio.sleep(0)
+        assert router.health["a"].probing
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        assert not router.health["a"].probing
+        a.delay = 0.01
+        assert await router.call([], str) == ("a", "ok")
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+import asyncio
+
+from infra.http.rate_limit import AIMDLimiter
+
+
+def test_new_callers_queue_behind_waiters():
+    async def run():
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        order = []
+
+        async def worker(n):
+            await limiter.acquire()
+            order.append(n)
+            await asyncio.sleep(0)
+            limiter.release(None)
+
+        waiters = [asyncio.create_task(worker(n)) for n in range(3)]
+        await asyncio.sleep(0)
+        limiter.release(None)
+        # Arrives while the freed slot is being handed to the first waiter.
+        await worker("late")
+        await asyncio.gather(*waiters)
+
+        assert order == [0, 1, 2, "late"]
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    async def run():
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        limiter.release(None)  # hands the slot to `first` ...
+        first.cancel()  # ... which is cancelled before it resumes
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.wait_for(second, timeout=1)
+
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+import asyncio
+
+from domain.services.result_cache import ResultCache
+from infra.db.session import init_db
+
+
+def test_concurrent_forced_refreshes_for_the_same_key_all_succeed():
+    init_db()
+    cache = ResultCache()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return {"cv_match_rate": 0.5}
+
+    async def run():
+        for round_no in range(5):
+            key = f"forced-refresh-race-{round_no}"
+            results = await asyncio.gather(*(
+                cache.get_or_compute(key, compute, force_refresh=True) for _ in range(8)))
+            assert results == [{"cv_match_rate": 0.5}] * 8
+            assert await cache.lookup(key) == {"cv_match_rate": 0.5}
+
+    asyncio.run(run())
+
+
+def test_cache_write_failure_does_not_fail_the_evaluation():
+    init_db()
+    cache = ResultCache()
+
+    async def broken_put(key, result):
+        raise RuntimeError("disk full")
+
+    cache._repo.put = broken_put
+
+    async def compute():
+        return {"cv_match_rate": 0.7}
+
+    assert asyncio.run(cache.get_or_compute("write-fails", compute)) == {"cv_match_rate": 0.7}